@@ -10,31 +10,339 @@ Author: Bram Donkers
 Date: 11/11/2025
 """
 
-from utils.import_xes import read_xes
+from utils.checkpoint import (LogCheckpoint, TraceRange, checkpoint_path, fingerprint, is_prefix, load_checkpoint,
+                              save_checkpoint, trace_bounds)
+from utils.event_stream import DEFAULT_MEMORY_MB, CaseStateStore
+from utils.import_xes import iter_xes, iter_xes_events
+from utils.lifecycle_log import filter_trace
+from utils.log_cache import load_log
+from utils.net_model import NameTable, FrequencyTable, Relation, PetriNet
+from utils.profiling import stage
+from utils.sampling import SampleInfo, reservoir_sample, uncertain_pairs, wilson_interval, z_score
 from collections import defaultdict
+from itertools import islice
 
 
 def compute_direct_followers(traces):
-    """Compute direct followers and their frequencies."""
-    df_counts = defaultdict(int)
-    total_out = defaultdict(int)
+    """
+    Compute direct followers and their frequencies.
+
+    Start and end activities, and the short loops `a b a` of every pair (see
+    short_loop_pairs), are counted in the same pass over the log.
+    Returns (freq, start_freq, end_freq).
+    """
+    counts = new_counts()
+    update_counts(counts, traces)
+    return counts_to_frequencies(counts)
+
+
+def new_counts():
+    """Empty running counts: (df_counts, total_out, start_counts, end_counts, loop2_counts)."""
+    return defaultdict(int), defaultdict(int), defaultdict(int), defaultdict(int), defaultdict(int)
+
+
+def update_counts(counts, traces, weight=1):
+    """
+    Add the direct followers, start / end activities and length-two loops of `traces` to running counts.
+
+    loop2_counts[(a, b)] counts `a b a` with a != b; self-loops are the (a, a) direct followers.
+    With weight=-1 the traces (counted before) are taken out again, and counts that drop to zero are removed.
+    """
+    df_counts, total_out, start_counts, end_counts, loop2_counts = counts
 
     for trace in traces:
+        if not trace:
+            continue
+        start_counts[trace[0]] += weight
+        end_counts[trace[-1]] += weight
         for i in range(len(trace) - 1):
             a, b = trace[i], trace[i + 1]
-            df_counts[(a, b)] += 1
-            total_out[a] += 1
+            df_counts[(a, b)] += weight
+            total_out[a] += weight
+        for a, b, c in zip(trace, trace[1:], trace[2:]):
+            if a == c and a != b:
+                loop2_counts[(a, b)] += weight
+
+    if weight < 0:
+        for table in counts:
+            for key in [key for key, n in table.items() if not n]:
+                del table[key]
+
+
+def counts_to_frequencies(counts, scale=1):
+    """
+    Turn running counts into (freq, start_freq, end_freq).
 
-    freq = []
+    With `scale` != 1 (a sample standing in for the whole log) the absolute
+    frequencies are extrapolated; relative frequencies are unaffected.
+    """
+    df_counts, total_out, start_counts, end_counts, loop2_counts = counts
+
+    freq = FrequencyTable(NameTable())
     for (a, b), abs_f in df_counts.items():
-        rel_f = abs_f / total_out[a]
-        freq.append({"pair": ([a], [b]), "abs_freq": abs_f, "rel_freq": rel_f})
+        freq.add(a, b, round(abs_f * scale), abs_f / total_out[a], round(loop2_counts.get((a, b), 0) * scale))
+
+    return freq, boundary_frequencies(start_counts, scale), boundary_frequencies(end_counts, scale)
+
+
+def count_log(path, sort_by_timestamp=False, lifecycle=None):
+    """
+    Parse a log and count it: (freq, start_freq, end_freq, sorted activities), or None for an empty log.
+
+    The counts only depend on the log, so they can be computed once and mined
+    with many thresholds (see AlphaMinerFrequencies.run_frequencies).
+    `lifecycle` selects a lifecycle policy (see utils/lifecycle_log.py); None
+    reads complete events only, as read_xes does by default.
+    """
+    return count_traces(load_log(path, sort_by_timestamp=sort_by_timestamp, lifecycle=lifecycle).values())
+
+
+def count_traces(traces):
+    """count_log on traces already in memory: (freq, start_freq, end_freq, sorted activities), or None if empty."""
+    traces = list(traces)
+    if not traces:
+        return None
+    activities = sorted({a for t in traces for a in t})
+    freq, start_freq, end_freq = compute_direct_followers(traces)
+    return freq, start_freq, end_freq, activities
+
+
+def count_log_approximate(path, sample_size=None, tolerance=None, batch_size=500, confidence=0.95,
+                          seed=None, sort_by_timestamp=False, lifecycle=None):
+    """
+    Count a sample of a log: (freq, start_freq, end_freq, sorted activities, SampleInfo), or None for an empty log.
+
+    Pass exactly one of:
+    - sample_size: reservoir-sample that many traces while streaming the log; counting is
+      limited to the sample and absolute frequencies are extrapolated to the whole log
+    - tolerance:   count traces in batches of `batch_size` (document order) and stop reading
+      once no rel_freq moved more than `tolerance` over the last batch; absolute
+      frequencies are those of the traces read
+
+    The SampleInfo holds the `confidence` interval of every pair's rel_freq.
+    """
+    if (sample_size is None) == (tolerance is None):
+        raise ValueError("Pass exactly one of sample_size and tolerance")
+
+    if lifecycle is None:
+        traces = (events for _, events in iter_xes(path, sort_by_timestamp=sort_by_timestamp) if events)
+    else:
+        traces = (
+            events for events in (
+                filter_trace(events, lifecycles, lifecycle)
+                for _, events, lifecycles in iter_xes_events(path, sort_by_timestamp=sort_by_timestamp)
+            ) if events
+        )
+    counts = new_counts()
+    df_counts, total_out, start_counts, end_counts, _ = counts
+
+    if sample_size is not None:
+        sample, n_read = reservoir_sample(traces, sample_size, seed)
+        update_counts(counts, sample)
+        info = SampleInfo("reservoir", len(sample), n_read, complete=True, converged=False, confidence=confidence)
+        scale = n_read / len(sample) if sample else 1
+    else:
+        n_read, converged, previous = 0, False, {}
+        while not converged:
+            batch = list(islice(traces, batch_size))
+            if not batch:
+                break
+            update_counts(counts, batch)
+            n_read += len(batch)
+            current = {(a, b): c / total_out[a] for (a, b), c in df_counts.items()}
+            converged = bool(previous) and max(
+                abs(rel - previous.get(pair, 0.0)) for pair, rel in current.items()
+            ) <= tolerance
+            previous = current
+        complete = not converged or next(traces, None) is None
+        info = SampleInfo("convergence", n_read, n_read, complete=complete, converged=converged,
+                          confidence=confidence)
+        scale = 1
+
+    if not info.n_sampled:
+        return None
+
+    z = z_score(confidence)
+    for (a, b), c in df_counts.items():
+        low, high = wilson_interval(c, total_out[a], z)
+        info.rel_low.append(low)
+        info.rel_high.append(high)
+
+    activities = sorted(set(start_counts) | set(end_counts) | {a for pair in df_counts for a in pair})
+    freq, start_freq, end_freq = counts_to_frequencies(counts, scale)
+    return freq, start_freq, end_freq, activities, info
+
+
+def count_log_incremental(path, checkpoint=None, sort_by_timestamp=False, lifecycle=None, full_check=True):
+    """
+    count_log for a log that grows by appended traces: (freq, start_freq, end_freq, activities, info), or None.
+
+    The running counts are kept in a checkpoint file (`checkpoint`, default next to the log,
+    see utils/checkpoint.py). When the log still starts with the part counted last time,
+    only the traces appended since are parsed and added; otherwise (first run, edited log,
+    other options) the whole log is counted. As in read_xes, an appended trace whose case id
+    was counted before replaces that trace. With full_check=False only the header and the
+    end of the counted part are compared. `info` reports {"traces", "appended", "resumed"}.
+    """
+    checkpoint = checkpoint or checkpoint_path(path)
+    options = {"sort_by_timestamp": sort_by_timestamp, "lifecycle": lifecycle}
+    header_end, offset = trace_bounds(path)
+
+    state = load_checkpoint(checkpoint, options)
+    resumed = state is not None and is_prefix(state, path, header_end, full_check)
+    if not resumed:
+        state = LogCheckpoint(options, new_counts(), header_end=header_end, offset=header_end)
+
+    appended = 0
+    if offset > state.offset:
+        with TraceRange(path, header_end, state.offset, offset) as source:
+            if lifecycle is None:
+                traces = iter_xes(source, sort_by_timestamp=sort_by_timestamp)
+            else:
+                traces = ((case_id, filter_trace(events, lifecycles, lifecycle)) for case_id, events, lifecycles
+                          in iter_xes_events(source, sort_by_timestamp=sort_by_timestamp))
+            cases = state.cases
+            for case_id, events in traces:
+                if not events:
+                    continue
+                if case_id is None:
+                    case_id = f"case_{len(cases)+1}"
+                previous = cases.get(case_id)
+                if previous is not None:
+                    update_counts(state.counts, [previous], weight=-1)
+                update_counts(state.counts, [events])
+                cases[case_id] = tuple(events)
+                appended += 1
+        state.n_traces = len(state.cases)
+        state.offset = offset
+        state.fingerprint = fingerprint(path, header_end, offset, full_check)
+        save_checkpoint(checkpoint, state)
+
+    info = {"traces": state.n_traces, "appended": appended, "resumed": resumed}
+    df_counts, _, start_counts, end_counts, _ = state.counts
+    if not start_counts:
+        return None
+    activities = sorted(set(start_counts) | set(end_counts) | {a for pair in df_counts for a in pair})
+    freq, start_freq, end_freq = counts_to_frequencies(state.counts)
+    return freq, start_freq, end_freq, activities, info
+
+
+def count_event_stream(events, memory_mb=DEFAULT_MEMORY_MB, spill_dir=None, store=None):
+    """
+    Count a stream of (case_id, activity) events: (freq, start_freq, end_freq, sorted activities), or None if empty.
+
+    The events of different cases may be interleaved, but each case's events must come in
+    order (e.g. a log sorted by timestamp, see utils/event_stream.iter_csv_events). All events
+    with the same case id form one trace, wherever they occur in the stream, as when an event
+    table is grouped by case (compute_direct_followers_dataframe); a case id is never counted
+    as two traces. Only the last two activities of every case are kept (as one int), within
+    `memory_mb`; idle cases spill to disk. Pass a CaseStateStore as `store` to inspect its
+    statistics afterwards.
+    """
+    names = NameTable()
+    df_counts, total_out, start_counts, loop2_counts = defaultdict(int), defaultdict(int), defaultdict(int), \
+        defaultdict(int)
+
+    if store is None:
+        store = CaseStateStore(memory_mb, spill_dir)
+    with store:
+        for case_id, activity in events:
+            c = names.intern(activity)
+            state = store.pop(case_id)
+            if state is None:
+                start_counts[c] += 1
+                store.put(case_id, c)
+                continue
+            # state: last activity in the low 32 bits, the one before it (+1, 0 for none) above
+            b, a = state & 0xFFFFFFFF, (state >> 32) - 1
+            df_counts[(b, c)] += 1
+            total_out[b] += 1
+            if a == c and a != b:
+                loop2_counts[(a, b)] += 1
+            store.put(case_id, c | (b + 1) << 32)
+
+        # No case ends before the stream does: the last activity of every case is its end
+        end_counts = defaultdict(int)
+        for _, state in store.items():
+            end_counts[state & 0xFFFFFFFF] += 1
+
+    if not start_counts:
+        return None
+    name = names.names
+    counts = new_counts()
+    for target, source in zip(counts, (df_counts, total_out, start_counts, end_counts, loop2_counts)):
+        for key, n in source.items():
+            target[(name[key[0]], name[key[1]]) if isinstance(key, tuple) else name[key]] = n
+
+    freq, start_freq, end_freq = counts_to_frequencies(counts)
+    return freq, start_freq, end_freq, sorted(name)
+
+
+def boundary_frequencies(counts, scale=1):
+    """Turn {activity: traces starting (or ending) with it} into frequency items."""
+    n_traces = sum(counts.values())
+    return [
+        {"activity": a, "abs_freq": round(abs_f * scale), "rel_freq": abs_f / n_traces}
+        for a, abs_f in counts.items()
+    ]
+
 
-    return freq
+def compute_direct_followers_dataframe(df, case_col, activity_col, timestamp_col=None):
+    """
+    Vectorised compute_direct_followers on an event table (one row per event).
+
+    Events are stably sorted by case (and timestamp), each row is compared with
+    the next row via a shifted column, and pairs within the same case are counted
+    with a groupby; length-two loops `a b a` compare each row with the row after
+    next the same way. Start/end activities come from the first/last row of each
+    case. Returns (freq, start_freq, end_freq, activities).
+    """
+    sort_cols = [case_col] if timestamp_col is None else [case_col, timestamp_col]
+    events = df[list(dict.fromkeys(sort_cols + [activity_col]))]
+    if timestamp_col is not None and events[timestamp_col].dtype.kind != "M":
+        import pandas as pd
+        events = events.assign(**{timestamp_col: pd.to_datetime(events[timestamp_col], utc=True)})
+    events = events.dropna(subset=[case_col, activity_col]).sort_values(sort_cols, kind="mergesort")
+
+    cases = events[case_col]
+    activities = events[activity_col].astype(str).str.replace(" ", "_", regex=False)
+    if activities.empty:
+        return FrequencyTable(NameTable()), [], [], []
+
+    # Direct follower (a, b) wherever the next row belongs to the same case
+    same_case = cases.eq(cases.shift(-1)).to_numpy()
+    sources = activities[same_case]
+    targets = activities.shift(-1)[same_case]
+    df_counts = sources.groupby([sources.to_numpy(), targets.to_numpy()], sort=False).size()
+    total_out = df_counts.groupby(level=0, sort=False).transform("sum")
+    rel_counts = df_counts / total_out
+
+    # Length-two loop a b a wherever the row after next is the same activity of the same case
+    next_activities = activities.shift(-1)
+    loop2 = (cases.eq(cases.shift(-2)) & activities.eq(activities.shift(-2)) & activities.ne(next_activities)).to_numpy()
+    loop2_counts = activities[loop2].groupby([activities[loop2].to_numpy(), next_activities[loop2].to_numpy()],
+                                             sort=False).size()
+    loop2_counts = loop2_counts.reindex(df_counts.index, fill_value=0) if len(loop2_counts) else \
+        df_counts * 0
+
+    freq = FrequencyTable(NameTable(), (
+        (a, b, int(abs_f), float(rel_f), int(loop2_f))
+        for (a, b), abs_f, rel_f, loop2_f in zip(df_counts.index, df_counts.to_numpy(), rel_counts.to_numpy(),
+                                                 loop2_counts.to_numpy())
+    ))
+
+    # Start and end activities: first and last row of every case
+    first_row = cases.ne(cases.shift(1)).to_numpy()
+    start_freq = boundary_frequencies(activities[first_row].value_counts(sort=False).to_dict())
+    end_freq = boundary_frequencies(activities[~same_case].value_counts(sort=False).to_dict())
+
+    return freq, start_freq, end_freq, sorted(activities.unique())
 
 
 def filter_by_frequency(freq_data, abs_threshold, rel_threshold):
     """Keep pairs above absolute and relative thresholds."""
+    if isinstance(freq_data, FrequencyTable):
+        return [([a], [b]) for a, b in freq_data.filter(abs_threshold, rel_threshold).pairs()]
     return [
         item["pair"]
         for item in freq_data
@@ -42,8 +350,135 @@ def filter_by_frequency(freq_data, abs_threshold, rel_threshold):
     ]
 
 
-def detect_parallel_and_causality(direct_followers):
-    """Separate parallel and causal relations."""
+def filter_boundary_activities(boundary_freq, abs_threshold, rel_threshold):
+    """
+    Keep start (or end) activities above absolute and relative thresholds.
+
+    The most frequent activity is always kept, so the net stays connected to
+    I_w / O_w even when the thresholds filter out every candidate.
+    """
+    kept = [
+        item["activity"]
+        for item in boundary_freq
+        if item["abs_freq"] >= abs_threshold and item["rel_freq"] >= rel_threshold
+    ]
+    if not kept and boundary_freq:
+        kept = [max(boundary_freq, key=lambda item: item["abs_freq"])["activity"]]
+    return kept
+
+
+def short_loop_pairs(freq: FrequencyTable, direct_followers, min_count=1):
+    """
+    Pairs (a, b) in a length-two loop (Alpha+ a <> b): both `a b a` and `b a b` occur at least
+    `min_count` times, and neither a nor b loops on itself among `direct_followers`.
+
+    Such a pair follows each other both ways without being parallel; the counts come from
+    the FrequencyTable's loop2 column, filled in the counting pass.
+    """
+    names = freq.table.names
+    looping = {a[0] for a, b in direct_followers if a == b}
+    loops = {
+        (names[a], names[b])
+        for a, b, n in zip(freq.src, freq.tgt, freq.loop2) if n >= min_count
+    }
+    return {(a, b) for a, b in loops if (b, a) in loops and a not in looping and b not in looping}
+
+
+def length_one_loops(direct_followers):
+    """Activities that directly follow themselves (Alpha+ length-one loops), in first-seen order."""
+    return list(dict.fromkeys(a[0] for a, b in direct_followers if a == b))
+
+
+def _through_loops(successors, start, loops):
+    """Activities outside `loops` reachable from `start` over paths whose inner activities are all in `loops`."""
+    reached, seen, stack = [], {start}, [start]
+    while stack:
+        for b in successors.get(stack.pop(), ()):
+            if b in seen:
+                continue
+            seen.add(b)
+            if b in loops:
+                stack.append(b)
+            else:
+                reached.append(b)
+    return reached
+
+
+def remove_length_one_loops(direct_followers, loops, T_i, T_o):
+    """
+    Alpha+ preprocessing: direct followers and start / end activities as if the activities in `loops`
+    were removed from the log.
+
+    `a t b` with t in `loops` becomes `a b`. From the pair counts alone, a > b is assumed whenever
+    a > t and t > b (possibly through several loop activities). Returns (direct_followers, T_i, T_o).
+    """
+    loops = set(loops)
+    successors, predecessors = defaultdict(list), defaultdict(list)
+    for a, b in direct_followers:
+        if a != b:
+            successors[a[0]].append(b[0])
+            predecessors[b[0]].append(a[0])
+
+    reduced = [pair for pair in direct_followers if pair[0][0] not in loops and pair[1][0] not in loops]
+    seen = {(a[0], b[0]) for a, b in reduced}
+    for a, b in direct_followers:
+        if a[0] not in loops and b[0] in loops:
+            for c in _through_loops(successors, a[0], loops):
+                if c != a[0] and (a[0], c) not in seen:
+                    seen.add((a[0], c))
+                    reduced.append(([a[0]], [c]))
+
+    def boundary(activities, neighbours):
+        kept = [a for a in activities if a not in loops]
+        for t in activities:
+            if t in loops:
+                kept += _through_loops(neighbours, t, loops)
+        return list(dict.fromkeys(kept))
+
+    return reduced, boundary(T_i, successors), boundary(T_o, predecessors)
+
+
+def attach_length_one_loops(loops, direct_followers, Y_w, P_w, F_w, T_i, T_o):
+    """
+    Alpha+ postprocessing: connect each length-one loop activity t both ways to every place (X, Y)
+    with {a | a > t} within X and {b | t > b} within Y (loop activities left out of both).
+
+    I_w counts as the place (∅, T_i) and O_w as (T_o, ∅), with T_i / T_o the start / end activities
+    without the loops. Loop activities that match no place are left unconnected (see unconnected_transitions).
+    """
+    loops = set(loops)
+    successors, predecessors = defaultdict(list), defaultdict(list)
+    for a, b in direct_followers:
+        if a != b:
+            successors[a[0]].append(b[0])
+            predecessors[b[0]].append(a[0])
+
+    candidates = [(set(), set(T_i), P_w[0])]
+    candidates += [(set(inputs), set(outputs), place) for (inputs, outputs), place in zip(Y_w, P_w[1:-1])]
+    candidates.append((set(T_o), set(), P_w[-1]))
+    for t in sorted(loops):
+        before = set(_through_loops(predecessors, t, loops))
+        after = set(_through_loops(successors, t, loops))
+        for inputs, outputs, place in candidates:
+            if before <= inputs and after <= outputs:
+                F_w += [[place, t], [t, place]]
+    return F_w
+
+
+def unconnected_transitions(T_w, F_w):
+    """Transitions of T_w without an input arc or without an output arc in F_w."""
+    sources = {src for src, _ in F_w}
+    targets = {tgt for _, tgt in F_w}
+    return [t for t in T_w if t not in sources or t not in targets]
+
+
+def detect_parallel_and_causality(direct_followers, short_loops=()):
+    """
+    Separate parallel and causal relations.
+
+    Pairs in `short_loops` (see short_loop_pairs) stay causal in both directions
+    instead of being taken for parallelism.
+    """
     parallel = []
     causality = list(direct_followers)
 
@@ -51,7 +486,7 @@ def detect_parallel_and_causality(direct_followers):
         for j in range(i + 1, len(direct_followers)):
             a1, b1 = direct_followers[i]
             a2, b2 = direct_followers[j]
-            if a1 == b2 and b1 == a2 and (a1 != b1):
+            if a1 == b2 and b1 == a2 and (a1 != b1) and (a1[0], b1[0]) not in short_loops:
                 parallel.append(direct_followers[i])
                 if direct_followers[i] in causality:
                     causality.remove(direct_followers[i])
@@ -90,62 +525,208 @@ def compute_places(Y_w):
 
 
 def compute_flows(Y_w, P_w, T_i, T_o):
-    """Generate flow relation F_w."""
-    F_w = [[P_w[0], T_i]]
+    """Generate flow relation F_w (T_i / T_o are the start / end activities)."""
+    F_w = [[P_w[0], t] for t in T_i]
     for idx, y in enumerate(Y_w, start=1):
         for i in y[0]:
             F_w.append([i, P_w[idx]])
         for i in y[1]:
             F_w.append([P_w[idx], i])
-    F_w.append([T_o, P_w[-1]])
+    F_w += [[t, P_w[-1]] for t in T_o]
     return F_w
 
 class AlphaMinerFrequencies:
     """Coordinates frequency-based Alpha Miner execution."""
 
-    def __init__(self, abs_threshold=1, rel_threshold=0.0):
+    def __init__(self, abs_threshold=1, rel_threshold=0.0, sort_by_timestamp=False,
+                 boundary_abs_threshold=1, boundary_rel_threshold=0.0, lifecycle=None, short_loops=True):
         self.abs_threshold = abs_threshold
         self.rel_threshold = rel_threshold
-
-        # Results (for evaluate.py compatibility)
-        self.direct_follower = []
-        self.direct_follower_freq = []
-        self.parallel = []
-        self.causality = []
+        self.sort_by_timestamp = sort_by_timestamp
+        # Lifecycle policy ("complete", "start", "start_complete", "all"); None: complete events, read directly
+        self.lifecycle = lifecycle
+        # Thresholds on how many traces start / end with an activity
+        self.boundary_abs_threshold = boundary_abs_threshold
+        self.boundary_rel_threshold = boundary_rel_threshold
+        # Alpha+ loops: length-one loops (a a) are taken out of the relations and attached to a place
+        # afterwards; length-two loops (a b a and b a b) stay causal both ways instead of parallel
+        self.short_loops = short_loops
+
+        # Results (for evaluate.py compatibility), packed into int-indexed
+        # containers over one NameTable; they iterate like the old nested lists
+        self.direct_follower = Relation(NameTable())
+        self.direct_follower_freq = FrequencyTable(NameTable())
+        self.parallel = Relation(NameTable())
+        self.causality = Relation(NameTable())
+        self.net = PetriNet()
         self.X_w = []
         self.Y_w = []
-        self.P_w = []
-        self.F_w = []
-        self.T_i = None
-        self.T_o = None
-        self.T_w = []
+        self.start_freq = []
+        self.end_freq = []
+        self.T_i = []
+        self.T_o = []
+        # Transitions without an input or output arc (e.g. all of their direct followers filtered out)
+        self.unconnected = []
+        # Approximate runs only (run_approximate)
+        self.sample_info = None
+        self.uncertain_pairs = []
+        # Event stream runs only (run_stream)
+        self.stream_stats = None
+        # Incremental runs only (run_incremental)
+        self.checkpoint_info = None
+
+    @property
+    def P_w(self):
+        """Place names, I_w first and O_w last."""
+        return self.net.place_names
+
+    @property
+    def T_w(self):
+        """Transition (activity) names."""
+        return self.net.transition_names
+
+    @property
+    def F_w(self):
+        """Flow relation; iterates as [src, tgt] pairs."""
+        return self.net.arcs
 
     def run(self, path):
         """Run Alpha Miner end-to-end on a log path."""
-        log_dict = read_xes(path)
-        traces = list(log_dict.values())
-        if not traces:
+        # Step 1: direct followers (plus start / end activities, same pass)
+        with stage("miner.count"):
+            counts = count_log(path, sort_by_timestamp=self.sort_by_timestamp, lifecycle=self.lifecycle)
+        if counts is None:
+            print("No traces found.")
+            return None
+        return self.run_frequencies(*counts)
+
+    def run_frequencies(self, freq, start_freq, end_freq, activities):
+        """
+        Run the remaining steps on precomputed counts (as returned by count_log).
+
+        The counts are only read, so one set can be shared by many miners; the
+        place names of each net are added to the shared NameTable.
+        """
+        self.direct_follower_freq, self.start_freq, self.end_freq = freq, start_freq, end_freq
+        return self._discover(activities)
+
+    def run_approximate(self, path, sample_size=None, tolerance=None, confidence=0.95, seed=None):
+        """
+        Run Alpha Miner on a sample of the log (see count_log_approximate).
+
+        Afterwards `sample_info` holds what was counted and the rel_freq bounds, and
+        `uncertain_pairs` lists the pairs whose filtering decision could flip on the
+        full log (their rel_freq interval straddles rel_threshold).
+        """
+        with stage("miner.count"):
+            counts = count_log_approximate(path, sample_size=sample_size, tolerance=tolerance, confidence=confidence,
+                                           seed=seed, sort_by_timestamp=self.sort_by_timestamp,
+                                           lifecycle=self.lifecycle)
+        if counts is None:
             print("No traces found.")
             return None
 
-        self.T_w = sorted({a for t in traces for a in t})
-        self.T_i, self.T_o = traces[0][0], traces[0][-1]
-
-        # Step 1: direct followers
-        self.direct_follower_freq = compute_direct_followers(traces)
-        self.direct_follower = filter_by_frequency(
-            self.direct_follower_freq, self.abs_threshold, self.rel_threshold
-        )
-
-        # Step 2: relations
-        self.parallel, self.causality = detect_parallel_and_causality(
-            self.direct_follower
-        )
+        *counts, self.sample_info = counts
+        result = self.run_frequencies(*counts)
+        self.uncertain_pairs = uncertain_pairs(self.direct_follower_freq, self.sample_info, self.rel_threshold)
+        return result
+
+    def run_incremental(self, path, checkpoint=None, full_check=True):
+        """
+        Run Alpha Miner on a growing log, counting only the traces appended since the last run
+        (see count_log_incremental). Afterwards `checkpoint_info` tells how many traces were new.
+        """
+        with stage("miner.count"):
+            counts = count_log_incremental(path, checkpoint, sort_by_timestamp=self.sort_by_timestamp,
+                                           lifecycle=self.lifecycle, full_check=full_check)
+        if counts is None:
+            print("No traces found.")
+            return None
+        *counts, self.checkpoint_info = counts
+        return self.run_frequencies(*counts)
+
+    def run_stream(self, events, memory_mb=DEFAULT_MEMORY_MB, spill_dir=None):
+        """
+        Run Alpha Miner on a stream of (case_id, activity) events with interleaved cases (see count_event_stream).
+
+        Per-case state beyond `memory_mb` spills to disk; afterwards `stream_stats`
+        holds the case and spill counts.
+        """
+        store = CaseStateStore(memory_mb, spill_dir)
+        with stage("miner.count"):
+            counts = count_event_stream(events, store=store)
+        self.stream_stats = store.stats()
+        if counts is None:
+            print("No traces found.")
+            return None
+        return self.run_frequencies(*counts)
+
+    def run_dataframe(self, df, case_col="case:concept:name", activity_col="concept:name",
+                      timestamp_col="time:timestamp"):
+        """
+        Run Alpha Miner end-to-end on an event table (pandas DataFrame).
+
+        Defaults match PM4Py's column names; pass timestamp_col=None to keep the
+        row order within each case instead of sorting by time.
+        """
+        with stage("miner.count"):
+            freq, start_freq, end_freq, activities = compute_direct_followers_dataframe(
+                df, case_col, activity_col, timestamp_col
+            )
+        if not activities:
+            print("No traces found.")
+            return None
 
-        # Step 3: model components
-        self.X_w, self.Y_w = compute_Xw_Yw(self.causality, self.parallel)
-        self.P_w = compute_places(self.Y_w)
-        self.F_w = compute_flows(self.Y_w, self.P_w, self.T_i, self.T_o)
+        # Step 1: direct followers (plus start / end activities)
+        return self.run_frequencies(freq, start_freq, end_freq, activities)
+
+    def _discover(self, activities):
+        """Steps shared by all input paths, starting from the frequency tables."""
+        table = self.direct_follower_freq.table
+        with stage("miner.filter"):
+            direct_follower = filter_by_frequency(
+                self.direct_follower_freq, self.abs_threshold, self.rel_threshold
+            )
+            self.T_i = filter_boundary_activities(
+                self.start_freq, self.boundary_abs_threshold, self.boundary_rel_threshold
+            )
+            self.T_o = filter_boundary_activities(
+                self.end_freq, self.boundary_abs_threshold, self.boundary_rel_threshold
+            )
+
+        # Steps 2 and 3: relations and model components. With short loops (Alpha+), length-one loops are
+        # taken out of the relations and attached to the places of their neighbours afterwards; a loop that
+        # ends up without an input or output arc is mined again with its classic relations
+        loops = length_one_loops(direct_follower) if self.short_loops else []
+        while True:
+            with stage("miner.relations"):
+                short_loops, T_i, T_o, followers = (), self.T_i, self.T_o, direct_follower
+                if loops:
+                    followers, T_i, T_o = remove_length_one_loops(direct_follower, loops, T_i, T_o)
+                if self.short_loops:
+                    short_loops = short_loop_pairs(self.direct_follower_freq, direct_follower,
+                                                   max(self.abs_threshold, 1))
+                parallel, causality = detect_parallel_and_causality(followers, short_loops)
+
+            with stage("miner.model"):
+                self.X_w, self.Y_w = compute_Xw_Yw(causality, parallel)
+                P_w = compute_places(self.Y_w)
+                F_w = compute_flows(self.Y_w, P_w, T_i, T_o)
+                if loops:
+                    F_w = attach_length_one_loops(loops, direct_follower, self.Y_w, P_w, F_w, T_i, T_o)
+                self.unconnected = unconnected_transitions(activities, F_w)
+
+            detached = set(loops) & set(self.unconnected)
+            if not detached:
+                break
+            loops = [t for t in loops if t not in detached]
+
+        # Pack results into the compact model
+        with stage("miner.pack"):
+            self.direct_follower = Relation.from_legacy(table, direct_follower)
+            self.parallel = Relation.from_legacy(table, parallel)
+            self.causality = Relation.from_legacy(table, causality)
+            self.net = PetriNet.from_lists(P_w, activities, F_w, table)
 
         return {
             "direct_follower": self.direct_follower,
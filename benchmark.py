@@ -0,0 +1,183 @@
+"""
+Small benchmark suite for the performance-sensitive parts of the pipeline.
+Every benchmark checks that the fast path returns the same result as the reference path before reporting timings.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import yaml
+
+from alpha_miner import AlphaMinerFrequencies
+from utils.import_xes import read_xes
+from utils.results_io import RESULT_FORMATS, read_results, to_serializable, write_results
+
+
+# Import-time budget (seconds) for the custom-miner path; none of these may load the heavy dependencies
+IMPORT_BUDGET = {"alpha_miner": 0.5, "grid_search": 0.5, "utils.import_xes": 0.5}
+HEAVY_MODULES = ("pm4py", "pandas", "graphviz")
+
+
+def time_call(fn, *args, repeat=3, **kwargs):
+    """Return (best wall-clock seconds over `repeat` runs, result of the last run)."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def bench_read_xes(log_path, repeat=3):
+    """Compare the stdlib and lxml XES backends on one log."""
+    t_etree, log_etree = time_call(read_xes, log_path, backend="etree", repeat=repeat)
+    t_lxml, log_lxml = time_call(read_xes, log_path, backend="lxml", repeat=repeat)
+
+    # Byte-identical output: same cases, same order, same activity strings
+    if repr(log_etree) != repr(log_lxml):
+        raise AssertionError(f"lxml backend output differs from etree backend for {log_path}")
+
+    print(f"\n=== read_xes on {log_path} ({len(log_etree)} traces) ===")
+    print(f"etree: {t_etree:.3f} s")
+    print(f"lxml:  {t_lxml:.3f} s")
+    print(f"Speedup: {t_etree / t_lxml:.2f}x")
+
+    return {"etree": t_etree, "lxml": t_lxml, "speedup": t_etree / t_lxml}
+
+
+def bench_results_io(log_path, abs_threshold=1, rel_threshold=0.0, repeat=3):
+    """Compare export + reload time of a configured net in every result format against plain yaml.safe_dump."""
+    miner = AlphaMinerFrequencies(abs_threshold, rel_threshold)
+    miner.run(log_path)
+    data = {
+        "dataset": os.path.basename(log_path),
+        "configured_net": {
+            "places": miner.P_w,
+            "transitions": miner.T_w,
+            "flows": miner.F_w,
+            "parallel": miner.parallel,
+            "causality": miner.causality,
+        },
+    }
+
+    print(f"\n=== Result export + reload for {log_path} ({len(miner.F_w)} flows) ===")
+    timings = {}
+    with tempfile.TemporaryDirectory() as folder:
+        base_path = os.path.join(folder, "results")
+
+        # Reference: the original pure-Python PyYAML round trip
+        def reference():
+            with open(base_path + ".ref.yaml", "w") as f:
+                yaml.safe_dump(to_serializable(data), f, sort_keys=False)
+            with open(base_path + ".ref.yaml", "r") as f:
+                return yaml.load(f, Loader=yaml.SafeLoader)
+
+        timings["yaml (pure Python)"], expected = time_call(reference, repeat=repeat)
+
+        for fmt in RESULT_FORMATS:
+            def round_trip():
+                return read_results(write_results(data, base_path, fmt))
+            try:
+                timings[fmt], loaded = time_call(round_trip, repeat=repeat)
+            except ImportError as e:
+                print(f"{fmt}: skipped ({e})")
+                continue
+            if loaded != expected:
+                raise AssertionError(f"{fmt} round trip differs from the YAML reference")
+
+    for name, t in timings.items():
+        print(f"{name:<20} {t:.3f} s  ({timings['yaml (pure Python)'] / t:.1f}x)")
+    return timings
+
+
+def bench_baselines(log_path, repeat=3):
+    """Check the native Alpha / Heuristics relations against PM4Py's and compare discovery times."""
+    from pm4py.algo.discovery.alpha import algorithm as alpha_miner
+    from pm4py.algo.discovery.heuristics import algorithm as heuristics_miner
+
+    from alpha_miner import count_log
+    from baselines import alpha_relations, follows_matrix, heuristics_relations, matrix_pairs
+    from utils.import_xes import read_xes_pm4py
+
+    # Both sides start from an already parsed log: PM4Py's EventLog, and the direct-follower counts
+    log = read_xes_pm4py(log_path)
+    freq = count_log(log_path, sort_by_timestamp=True)[0]
+
+    def native():
+        names, C = follows_matrix(freq)
+        return matrix_pairs(names, alpha_relations(C)), matrix_pairs(names, heuristics_relations(C))
+
+    def pm4py():
+        net, _, _ = alpha_miner.apply(log)
+        alpha = set()
+        for p in net.places:
+            pre = {arc.source.label for arc in p.in_arcs if getattr(arc.source, "label", None)}
+            post = {arc.target.label for arc in p.out_arcs if getattr(arc.target, "label", None)}
+            alpha |= {(a, b) for a in pre for b in post}
+        heu_net = heuristics_miner.apply_heu(log)
+        heuristics = {(a, b) for a in heu_net.dependency_matrix for b in heu_net.dependency_matrix[a] if a != b}
+        return alpha, heuristics
+
+    t_native, (alpha, heuristics) = time_call(native, repeat=repeat)
+    t_pm4py, (pm4py_alpha, pm4py_heuristics) = time_call(pm4py, repeat=1)
+    if alpha != pm4py_alpha or heuristics != pm4py_heuristics:
+        raise AssertionError(f"Native baseline relations differ from PM4Py's for {log_path}")
+
+    print(f"\n=== Alpha + Heuristics baselines on {log_path} ===")
+    print(f"PM4Py:  {t_pm4py:.3f} s")
+    print(f"Native: {t_native:.3f} s")
+    print(f"Speedup: {t_pm4py / t_native:.1f}x")
+    return {"pm4py": t_pm4py, "native": t_native}
+
+
+def bench_import_time(budget=None):
+    """
+    Import each module in a fresh interpreter and check it against its time budget.
+
+    Fails when a module exceeds its budget or pulls in PM4Py, pandas or graphviz.
+    """
+    budget = budget or IMPORT_BUDGET
+    probe = (
+        "import sys, time; start = time.perf_counter(); import {module}; "
+        "elapsed = time.perf_counter() - start; "
+        "heavy = [m for m in {heavy!r} if m in sys.modules]; "
+        "print(elapsed); print(','.join(heavy))"
+    )
+
+    print("\n=== Import time (fresh interpreter) ===")
+    timings, failures = {}, []
+    for module, limit in budget.items():
+        out = subprocess.run(
+            [sys.executable, "-c", probe.format(module=module, heavy=HEAVY_MODULES)],
+            capture_output=True, text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.splitlines()
+        elapsed, heavy = float(out[0]), [m for m in out[1:2] if m]
+        timings[module] = elapsed
+
+        status = "ok"
+        if heavy:
+            status = f"FAIL (loaded {heavy[0]})"
+        elif elapsed > limit:
+            status = "FAIL (over budget)"
+        if status != "ok":
+            failures.append(module)
+        print(f"{module:<20} {elapsed:.3f} s  (budget {limit:.2f} s)  {status}")
+
+    if failures:
+        raise AssertionError(f"Import budget exceeded for: {', '.join(failures)}")
+    return timings
+
+
+if __name__ == "__main__":
+
+    ### Configuration ###
+    DATASET = "BPI_Challenge_2012.xes"
+    LOG_PATH = f"data/{DATASET}"
+
+    bench_import_time()
+    bench_read_xes(LOG_PATH)
+    bench_results_io(LOG_PATH)
+    bench_baselines(LOG_PATH)
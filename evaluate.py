@@ -1,35 +1,40 @@
-from pm4py.algo.discovery.alpha import algorithm as alpha_miner
-from pm4py.algo.discovery.heuristics import algorithm as heuristics_miner
+# PM4Py is imported inside the baseline evaluators only, so the custom miner and
+# grid search can import this module without loading it
+import time
 
 from alpha_miner import AlphaMinerFrequencies
-from utils.gold_standards import standards
+from utils.gold_standards import standards, RelationIndex
 from utils.import_xes import read_xes_pm4py
+from utils.net_model import Relation
 
 
-def compute_metrics(discovered: set, gold: set):
+def compute_metrics(discovered: set, gold):
     """
     Compute precision, recall, F1-score, and confusion matrix elements:
     TP, FP, FN, TN — based on discovered and gold relations.
 
-    `discovered` and `gold` are sets of (a, b) activity pairs.
+    `discovered` is a set of (a, b) activity pairs; `gold` is either such a set
+    or a gold standard's RelationIndex (which skips rebuilding its pairs).
     """
-    # Derive activity universe from gold and discovered relations
-    activities = {a for a, _ in gold | discovered} | {b for _, b in gold | discovered}
-
-    # Generate full set of possible (a, b) activity pairs (excluding self-loops)
-    all_possible_pairs = {
-        (a, b) for a in activities for b in activities if a != b
-    }
-
-    tp_set = discovered & gold
-    fp_set = discovered - gold
-    fn_set = gold - discovered
-    tn_set = all_possible_pairs - (tp_set | fp_set | fn_set)
+    if not isinstance(gold, RelationIndex):
+        gold = RelationIndex(gold)
 
-    tp = len(tp_set)
-    fp = len(fp_set)
-    fn = len(fn_set)
-    tn = len(tn_set)
+    # Derive activity universe from gold and discovered relations
+    activities = set(gold.activities)
+    for a, b in discovered:
+        activities.add(a)
+        activities.add(b)
+
+    tp = sum(1 for pair in discovered if pair in gold)
+    fp = len(discovered) - tp
+    fn = len(gold) - tp
+
+    # TN: all possible (a, b) pairs excluding self-loops, minus those discovered or in gold
+    # (counted, not enumerated)
+    n = len(activities)
+    n_discovered_non_self = sum(1 for a, b in discovered if a != b)
+    n_tp_non_self = sum(1 for a, b in discovered if a != b and (a, b) in gold)
+    tn = n * (n - 1) - (n_discovered_non_self + gold.n_non_self - n_tp_non_self)
 
     precision = tp / (tp + fp) if (tp + fp) else 0
     recall = tp / (tp + fn) if (tp + fn) else 0
@@ -38,8 +43,25 @@ def compute_metrics(discovered: set, gold: set):
     return precision, recall, f1, tp, fp, fn, tn
 
 
+def relation_metrics(relations: set, gold):
+    """Metrics of a discovered relation set as the result dict shared by all evaluators."""
+    precision, recall, f1, tp, fp, fn, tn = compute_metrics(relations, gold)
+    return {
+        "precision": precision,
+        "recall": recall,
+        "f1": f1,
+        "relations": relations,
+        "tp": tp,
+        "fp": fp,
+        "fn": fn,
+        "tn": tn
+    }
+
+
 def flatten_pairs(pairs):
     """Convert [['a'], ['b']] pairs into ('a','b') tuples."""
+    if isinstance(pairs, Relation):
+        return set(pairs.pairs())
     flat = []
     for pair in pairs:
         a, b = pair
@@ -48,9 +70,11 @@ def flatten_pairs(pairs):
 
 
 def evaluate_pm4py_alpha(dataset: str, log_path: str):
+    """Run PM4Py Alpha Miner and return its metrics vs gold standard."""
+    from pm4py.algo.discovery.alpha import algorithm as alpha_miner
 
     gold = standards[dataset]
-    gold_relations = gold.direct_succession
+    gold_relations = gold.index
 
     log = read_xes_pm4py(log_path)
     net, initial_marking, final_marking = alpha_miner.apply(log)
@@ -64,24 +88,15 @@ def evaluate_pm4py_alpha(dataset: str, log_path: str):
             for b in post:
                 relations.add((a, b))
 
-    precision, recall, f1, tp, fp, fn, tn = compute_metrics(relations, gold_relations)
-
-    return {
-        "precision": precision,
-        "recall": recall,
-        "f1": f1,
-        "relations": relations,
-        "tp": tp,
-        "fp": fp,
-        "fn": fn,
-        "tn": tn
-    }
+    return relation_metrics(relations, gold_relations)
 
 
 def evaluate_pm4py_heuristics(dataset: str, log_path: str):
     """Run PM4Py Heuristics Miner (default behavior) and return its metrics vs gold standard."""
+    from pm4py.algo.discovery.heuristics import algorithm as heuristics_miner
+
     gold = standards[dataset]
-    gold_relations = gold.direct_succession
+    gold_relations = gold.index
 
     log = read_xes_pm4py(log_path)
     heu_net = heuristics_miner.apply_heu(log)
@@ -94,31 +109,50 @@ def evaluate_pm4py_heuristics(dataset: str, log_path: str):
                 relations.add((src, tgt))
 
     # Evaluate against gold standard
-    precision, recall, f1, tp, fp, fn, tn = compute_metrics(relations, gold_relations)
+    return relation_metrics(relations, gold_relations)
 
-    return {
-        "precision": precision,
-        "recall": recall,
-        "f1": f1,
-        "relations": relations,
-        "tp": tp,
-        "fp": fp,
-        "fn": fn,
-        "tn": tn
-    }
 
+def evaluate_native_alpha(dataset: str, log_path: str):
+    """Classic Alpha relations computed on the direct-follower matrix (same relations as evaluate_pm4py_alpha)."""
+    from baselines import alpha_relations, log_matrix, matrix_pairs
 
-def evaluate_custom_alpha(dataset: str, log_path: str, abs_threshold: int = 0, rel_threshold: float = 0.0):
-    """Run Custom Alpha Miner (frequency-based) and return its metrics vs gold standard."""
-    gold = standards[dataset]
-    gold_relations = gold.direct_succession
+    names, C = log_matrix(log_path)
+    return relation_metrics(matrix_pairs(names, alpha_relations(C)), standards[dataset].index)
+
+
+def evaluate_native_heuristics(dataset: str, log_path: str):
+    """Heuristics relations computed on the direct-follower matrix (same relations as evaluate_pm4py_heuristics)."""
+    from baselines import heuristics_relations, log_matrix, matrix_pairs
+
+    names, C = log_matrix(log_path)
+    return relation_metrics(matrix_pairs(names, heuristics_relations(C)), standards[dataset].index)
+
+
+def evaluate_custom_alpha(dataset: str, log_path: str, abs_threshold: int = 0, rel_threshold: float = 0.0,
+                          replay_tree=None, counts=None, lifecycle=None):
+    """
+    Run Custom Alpha Miner (frequency-based) and return its metrics vs gold standard.
 
-    miner = AlphaMinerFrequencies(abs_threshold=abs_threshold, rel_threshold=rel_threshold)
-    miner.run(log_path)
+    With `counts` (alpha_miner.count_log of the same log) the log is not counted
+    again, only mined with the given thresholds. With `replay_tree` (a
+    conformance.PrefixTree of the same log) the discovered net is also replayed
+    on the log, adding "fitness" and "replay_precision". `lifecycle` is the
+    miner's lifecycle policy (see utils/lifecycle_log.py).
+    """
+    gold = standards[dataset]
+    gold_relations = gold.index
+
+    miner = AlphaMinerFrequencies(abs_threshold=abs_threshold, rel_threshold=rel_threshold, lifecycle=lifecycle)
+    start = time.perf_counter()
+    if counts is not None:
+        miner.run_frequencies(*counts)
+    else:
+        miner.run(log_path)
+    mining_time = time.perf_counter() - start
     custom_relations = flatten_pairs(miner.direct_follower)
     precision, recall, f1, tp, fp, fn, tn = compute_metrics(custom_relations, gold_relations)
 
-    return {
+    result = {
         "precision": precision,
         "recall": recall,
         "f1": f1,
@@ -126,9 +160,20 @@ def evaluate_custom_alpha(dataset: str, log_path: str, abs_threshold: int = 0, r
         "tp": tp,
         "fp": fp,
         "fn": fn,
-        "tn": tn
+        "tn": tn,
+        "places": len(miner.P_w),
+        "flows": len(miner.F_w),
+        "mining_time": mining_time,
     }
 
+    if replay_tree is not None:
+        from conformance import compile_net, token_replay
+        replay = token_replay(compile_net(miner.net), replay_tree)
+        result["fitness"] = replay.fitness
+        result["replay_precision"] = replay.precision
+
+    return result
+
 
 if __name__ == "__main__":
 
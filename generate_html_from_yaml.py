@@ -2,51 +2,104 @@
 Generate HTML report:
 1️⃣ Best Custom Miner results (detailed metrics)
 2️⃣ Comparison of all miners (F1-scores)
+3️⃣ Pareto front of the grid search
+4️⃣ Threshold sensitivity: precision / recall / F1 heatmaps over the full grid (from the .npz grid files)
+
+Per-dataset summaries are cached in an index keyed by result file mtime/size, so only changed
+files are re-parsed, and table rows are streamed straight into the output file.
+Result files may be YAML, JSON or MessagePack (see utils.results_io).
 """
 
+import json
 import os
-import yaml
 
-# --- loader fix for !!python/tuple tags ---
-class TupleSafeLoader(yaml.SafeLoader):
-    pass
-def construct_python_tuple(loader, node):
-    return tuple(loader.construct_sequence(node))
-TupleSafeLoader.add_constructor(u'tag:yaml.org,2002:python/tuple', construct_python_tuple)
+from utils.results_io import find_result_files, read_results
+
+INDEX_FILE = ".report_index.json"
+# Bump when summarize_results changes, so summaries cached in an older format are rebuilt
+INDEX_VERSION = 2
+# Column labels of the baselines by the source recorded in the results (main.py --pm4py-baselines)
+BASELINE_SOURCES = {"native": "Native", "pm4py": "PM4Py"}
+
+
+def summarize_results(data):
+    """Reduce one parsed YAML result file to the fields shown in the report."""
+    params = data.get("best_parameters", {})
+
+    def get_eval(key):
+        sec = data.get(key, {})
+        return {
+            "precision": sec.get("precision", 0.0),
+            "recall": sec.get("recall", 0.0),
+            "f1": sec.get("f1", 0.0),
+            "tp": sec.get("tp"),
+            "fp": sec.get("fp"),
+            "fn": sec.get("fn"),
+            "tn": sec.get("tn"),
+        }
+
+    return {
+        "dataset": data["dataset"],
+        "params": (params.get("abs_threshold", 0), params.get("rel_threshold", 0.0)),
+        "custom_best": get_eval("evaluation_custom"),
+        "custom_default": get_eval("evaluation_default"),
+        "alpha": get_eval("evaluation_alpha"),
+        "heuristic": get_eval("evaluation_heuristic"),
+        "baseline_source": data.get("baseline_source"),
+        "grid_file": data.get("grid_file"),
+        "pareto_front": [
+            {key: r.get(key) for key in ("abs", "rel", "precision", "recall", "f1", "places", "flows", "mining_time")}
+            for r in data.get("pareto_front", [])
+        ],
+    }
+
+
+def load_index(index_path):
+    """
+    Read the summary index ({file: {"mtime_ns", "size", "summary"}}); empty if missing, corrupt
+    or written for another INDEX_VERSION.
+    """
+    try:
+        with open(index_path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(index, dict) or index.get("version") != INDEX_VERSION:
+        return {}
+    return index.get("files", {})
 
 
-def load_yaml_results(folder="outputs/yamls"):
-    """Load YAML result files from the given folder."""
+def load_yaml_results(folder="outputs/yamls", index_path=None):
+    """
+    Load result summaries (YAML, JSON or MessagePack) from the given folder.
+
+    Files whose mtime and size match the index are not parsed again.
+    """
+    index_path = index_path or os.path.join(folder, INDEX_FILE)
+    index = load_index(index_path)
+    new_index = {}
+
     datasets = []
-    for file in sorted(os.listdir(folder)):
-        if not file.endswith(".yaml"):
-            continue
-        with open(os.path.join(folder, file), "r") as f:
-            data = yaml.load(f, Loader=TupleSafeLoader)
-
-        dataset = data["dataset"]
-        params = data.get("best_parameters", {})
-
-        def get_eval(key):
-            sec = data.get(key, {})
-            return {
-                "precision": sec.get("precision", 0.0),
-                "recall": sec.get("recall", 0.0),
-                "f1": sec.get("f1", 0.0),
-                "tp": sec.get("tp"),
-                "fp": sec.get("fp"),
-                "fn": sec.get("fn"),
-                "tn": sec.get("tn"),
-            }
-
-        datasets.append({
-            "dataset": dataset,
-            "params": (params.get("abs_threshold", 0), params.get("rel_threshold", 0.0)),
-            "custom_best": get_eval("evaluation_custom"),
-            "custom_default": get_eval("evaluation_default"),
-            "alpha": get_eval("evaluation_alpha"),
-            "heuristic": get_eval("evaluation_heuristic"),
-        })
+    for path in find_result_files(folder).values():
+        file = os.path.basename(path)
+        stat = os.stat(path)
+
+        entry = index.get(file)
+        if entry is None or entry["mtime_ns"] != stat.st_mtime_ns or entry["size"] != stat.st_size:
+            data = read_results(path)
+            entry = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "summary": summarize_results(data)}
+
+        new_index[file] = entry
+        summary = dict(entry["summary"])
+        summary["params"] = tuple(summary["params"])
+        if summary.get("grid_file"):
+            summary["grid_path"] = os.path.join(folder, summary["grid_file"])
+        datasets.append(summary)
+
+    if new_index != index:
+        with open(index_path, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "files": new_index}, f)
+
     return datasets
 
 
@@ -60,12 +113,48 @@ def f1_class(value: float) -> str:
         return "f1-low"
 
 
+def heat_color(value: float) -> str:
+    """Background colour of a heatmap cell: red (0) through yellow to green (1)."""
+    return f"hsl({max(0.0, min(1.0, value)) * 120:.0f}, 70%, 78%)"
+
+
+def write_heatmap(f, title, values, abs_values, rel_values, best=None):
+    """One metric over the grid as an HTML table: rows abs, columns rel; `best` (i, j) is outlined."""
+    f.write(f"""    <table class="heatmap">
+      <caption>{title}</caption>
+      <thead><tr><th>abs \\ rel</th>{''.join(f'<th>{rel:.2f}</th>' for rel in rel_values)}</tr></thead>
+      <tbody>
+""")
+    for i, abs_t in enumerate(abs_values):
+        cells = []
+        for j, value in enumerate(values[i]):
+            outline = ' class="best"' if best == (i, j) else ""
+            if value != value:  # NaN: cell not evaluated
+                cells.append(f"<td{outline}>–</td>")
+            else:
+                cells.append(f'<td{outline} style="background:{heat_color(value)}">{value:.2f}</td>')
+        f.write(f"        <tr><th>{abs_t}</th>{''.join(cells)}</tr>\n")
+    f.write("""      </tbody>
+    </table>
+""")
+
+
 def generate_html_from_yaml(output_file="outputs/comparison_report.html", folder="outputs/yamls"):
     os.makedirs(os.path.dirname(output_file), exist_ok=True)
     datasets = load_yaml_results(folder)
 
+    with open(output_file, "w", encoding="utf-8") as f:
+        write_report(f, datasets)
+
+    print(f"HTML report generated: {output_file}")
+    return output_file
+
+
+def write_report(f, datasets):
+    """Stream the HTML report for `datasets` into the open file `f`."""
+
     # --- HTML HEADER ---
-    html = """<!DOCTYPE html>
+    f.write("""<!DOCTYPE html>
 <html>
 <head>
   <meta charset="utf-8">
@@ -82,14 +171,20 @@ def generate_html_from_yaml(output_file="outputs/comparison_report.html", folder
     .f1-high { color: #2e7d32; font-weight: bold; }
     .f1-medium { color: #f57c00; font-weight: bold; }
     .f1-low { color: #c62828; font-weight: bold; }
+    .heatmaps { display: flex; flex-wrap: wrap; gap: 20px; justify-content: center; }
+    table.heatmap { width: auto; margin: 10px 0; }
+    table.heatmap caption { font-weight: bold; padding: 6px; }
+    table.heatmap th, table.heatmap td { padding: 4px 8px; font-size: 0.85em; }
+    table.heatmap tr:hover { background-color: inherit; }
+    table.heatmap td.best { outline: 3px solid #333; outline-offset: -3px; font-weight: bold; }
   </style>
 </head>
 <body>
   <h1>Alpha Miner Comparison Report</h1>
-"""
+""")
 
     # --- TABLE 1: Best Custom Miner Detailed Results ---
-    html += """
+    f.write("""
   <h2>Summary of Best Custom Miner Results (from Grid Search)</h2>
   <table>
     <thead>
@@ -106,11 +201,11 @@ def generate_html_from_yaml(output_file="outputs/comparison_report.html", folder
       </tr>
     </thead>
     <tbody>
-"""
+""")
 
     for d in datasets:
         cb = d["custom_best"]
-        html += f"""      <tr>
+        f.write(f"""      <tr>
         <td class="dataset">{d['dataset']}</td>
         <td>({d['params'][0]}, {d['params'][1]:.2f})</td>
         <td>{cb['precision']:.3f}</td>
@@ -121,14 +216,24 @@ def generate_html_from_yaml(output_file="outputs/comparison_report.html", folder
         <td>{cb['fn'] if cb['fn'] is not None else '–'}</td>
         <td>{cb['tn'] if cb['tn'] is not None else '–'}</td>
       </tr>
-"""
+""")
 
-    html += """    </tbody>
+    f.write("""    </tbody>
   </table>
-"""
+""")
 
     # --- TABLE 2: Comparison of All Methods ---
-    html += """
+    # One source for all datasets goes in the headers; otherwise each baseline cell names its own
+    sources = {d.get("baseline_source") for d in datasets}
+    common = BASELINE_SOURCES.get(sources.pop()) if len(sources) == 1 else None
+    alpha_header = f"{common} Alpha" if common else "Alpha Baseline"
+    heuristic_header = f"{common} Heuristic" if common else "Heuristic Baseline"
+
+    def source_note(d):
+        label = BASELINE_SOURCES.get(d.get("baseline_source"))
+        return f' <small>({label})</small>' if label and not common else ""
+
+    f.write(f"""
   <h2>Comparison of F1 Scores Across All Methods</h2>
   <table>
     <thead>
@@ -137,40 +242,93 @@ def generate_html_from_yaml(output_file="outputs/comparison_report.html", folder
         <th>Best Params (abs, rel)</th>
         <th>Custom (0,0)</th>
         <th>Custom (Best)</th>
-        <th>PM4Py Alpha</th>
-        <th>PM4Py Heuristic</th>
+        <th>{alpha_header}</th>
+        <th>{heuristic_header}</th>
       </tr>
     </thead>
     <tbody>
-"""
+""")
 
     for d in datasets:
         cd, cb, al, he = d["custom_default"], d["custom_best"], d["alpha"], d["heuristic"]
-        html += f"""      <tr>
+        f.write(f"""      <tr>
         <td class="dataset">{d['dataset']}</td>
         <td>({d['params'][0]}, {d['params'][1]:.2f})</td>
         <td class="{f1_class(cd['f1'])}">{cd['f1']:.3f}</td>
         <td class="{f1_class(cb['f1'])}">{cb['f1']:.3f}</td>
-        <td class="{f1_class(al['f1'])}">{al['f1']:.3f}</td>
-        <td class="{f1_class(he['f1'])}">{he['f1']:.3f}</td>
+        <td class="{f1_class(al['f1'])}">{al['f1']:.3f}{source_note(d)}</td>
+        <td class="{f1_class(he['f1'])}">{he['f1']:.3f}{source_note(d)}</td>
       </tr>
-"""
+""")
 
-    html += """    </tbody>
+    f.write("""    </tbody>
   </table>
 
+  <h2>Pareto Front of the Grid Search (precision, recall, places, flows)</h2>
+  <table>
+    <thead>
+      <tr>
+        <th>Dataset</th>
+        <th>Params (abs, rel)</th>
+        <th>Precision</th>
+        <th>Recall</th>
+        <th>F1 Score</th>
+        <th>Places</th>
+        <th>Flows</th>
+        <th>Mining Time (ms)</th>
+      </tr>
+    </thead>
+    <tbody>
+""")
+
+    for d in datasets:
+        for r in d.get("pareto_front", []):
+            f.write(f"""      <tr>
+        <td class="dataset">{d['dataset']}</td>
+        <td>({r['abs']}, {r['rel']:.2f})</td>
+        <td>{r['precision']:.3f}</td>
+        <td>{r['recall']:.3f}</td>
+        <td class="{f1_class(r['f1'])}">{r['f1']:.3f}</td>
+        <td>{r['places']}</td>
+        <td>{r['flows']}</td>
+        <td>{r['mining_time'] * 1000:.2f}</td>
+      </tr>
+""")
+
+    f.write("""    </tbody>
+  </table>
+""")
+
+    # --- HEATMAPS: every grid cell, read from the stored arrays ---
+    grids = [(d, d["grid_path"]) for d in datasets if d.get("grid_path")]
+    if grids:
+        from utils.grid_arrays import load_grid
+
+        f.write("""
+  <h2>Threshold Sensitivity over the Full Grid (precision, recall, F1)</h2>
+""")
+        for d, path in grids:
+            grid = load_grid(path)
+            if grid is None:
+                continue
+            best = None
+            if d["params"] in {(a, r) for a in grid["abs"] for r in grid["rel"]}:
+                best = (list(grid["abs"]).index(d["params"][0]), list(grid["rel"]).index(d["params"][1]))
+            f.write(f"""  <h3 style="text-align:center">{d['dataset']}</h3>
+  <div class="heatmaps">
+""")
+            for metric, title in (("precision", "Precision"), ("recall", "Recall"), ("f1", "F1 Score")):
+                write_heatmap(f, title, grid[metric], grid["abs"], grid["rel"], best)
+            f.write("""  </div>
+""")
+
+    f.write("""
   <footer style="text-align:center;color:#666;margin-top:30px;font-size:0.9em;">
     Report generated automatically from YAML exports.
   </footer>
 </body>
 </html>
-"""
-
-    with open(output_file, "w", encoding="utf-8") as f:
-        f.write(html)
-
-    print(f"HTML report generated: {output_file}")
-    return output_file
+""")
 
 
 if __name__ == "__main__":
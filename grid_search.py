@@ -1,8 +1,11 @@
 import time
+from alpha_miner import count_log
 from evaluate import evaluate_custom_alpha
+from utils.log_cache import load_log
 
 
-def run_alpha_experiment(dataset_name, log_path, abs_values, rel_values, verbose=False):
+def run_alpha_experiment(dataset_name, log_path, abs_values, rel_values, verbose=False, replay=True,
+                         lifecycle=None):
     """
     Run grid search experiment for one dataset.
 
@@ -11,44 +14,87 @@ def run_alpha_experiment(dataset_name, log_path, abs_values, rel_values, verbose
         log_path (str): Path to the .xes log file.
         abs_values (list[int]): Absolute threshold values.
         rel_values (list[float]): Relative threshold values.
+        replay (bool): Also replay each discovered net on the log (token-replay
+            fitness and precision, see conformance.py).
+        lifecycle (str): Lifecycle policy of the log (see utils/lifecycle_log.py);
+            None reads complete events only.
 
     Returns:
-        dict: Best result and all results sorted by F1 score.
+        dict: Best result and all results sorted by F1 score, plus the Pareto front over
+        precision, recall, number of places and number of flows (see utils/pareto.py),
+        and every cell's metrics as (abs x rel) arrays under "grid" (see utils/grid_arrays.py).
     """
     print(f"\n=== Running experiment for {dataset_name} ===")
     start_time = time.time()
 
     results = []
 
+    # The log is counted once; every cell only mines the shared counts with its thresholds
+    counts = count_log(log_path, lifecycle=lifecycle)
+
+    # The log's prefix tree is built once and shared by every cell
+    replay_tree = None
+    if replay:
+        from conformance import build_prefix_tree, log_variants
+        replay_tree = build_prefix_tree(log_variants(load_log(log_path, lifecycle=lifecycle).values()))
+
     # --- Grid search for custom miner ---
     for abs_t in abs_values:
         for rel_t in rel_values:
 
             custom = evaluate_custom_alpha(dataset_name, log_path,
                                            abs_threshold=abs_t,
-                                           rel_threshold=rel_t)
-            results.append({
+                                           rel_threshold=rel_t,
+                                           replay_tree=replay_tree,
+                                           counts=counts,
+                                           lifecycle=lifecycle)
+            result = {
                 "abs": abs_t,
                 "rel": rel_t,
                 "precision": custom["precision"],
                 "recall": custom["recall"],
                 "f1": custom["f1"],
-            })
-            print(f"abs={abs_t}, rel={rel_t:.2f} → Custom F1={custom['f1']:.3f}")
+                "places": custom["places"],
+                "flows": custom["flows"],
+                "mining_time": custom["mining_time"],
+            }
+            if replay:
+                result["fitness"] = custom["fitness"]
+                result["replay_precision"] = custom["replay_precision"]
+                print(f"abs={abs_t}, rel={rel_t:.2f} → Custom F1={custom['f1']:.3f}, "
+                      f"fitness={custom['fitness']:.3f}, replay precision={custom['replay_precision']:.3f}")
+            else:
+                print(f"abs={abs_t}, rel={rel_t:.2f} → Custom F1={custom['f1']:.3f}")
+            results.append(result)
+
+    # --- Pareto front (objectives of all cells in one array, rows in grid order) ---
+    from utils.grid_arrays import grid_arrays
+    from utils.pareto import OBJECTIVES, objective_matrix, pareto_mask
+    objectives = objective_matrix(results)
+    on_front = pareto_mask(objectives, list(OBJECTIVES.values())) if results else []
+    front = [r for r, keep in zip(results, on_front) if keep]
 
     # --- Sort by F1 ---
     results_sorted = sorted(results, key=lambda r: r["f1"], reverse=True)
     best = results_sorted[0] if results_sorted else None
+    front = sorted(front, key=lambda r: r["f1"], reverse=True)
 
     if verbose:
 
         # --- Print summary ---
         print("\n=== GRID SEARCH RESULTS (sorted by Custom F1) ===")
-        print(f"{'abs':>4} | {'rel':>4} | {'Precision':>10} | {'Recall':>10} | {'F1':>10}")
-        print("-" * 50)
+        print(f"{'abs':>4} | {'rel':>4} | {'Precision':>10} | {'Recall':>10} | {'F1':>10} | {'Fitness':>10} | {'Replay P':>10}")
+        print("-" * 78)
         for r in results_sorted:
-            print(f"{r['abs']:>4} | {r['rel']:>4.1f} | {r['precision']:>10.3f} | {r['recall']:>10.3f} | {r['f1']:>10.3f}")
+            print(f"{r['abs']:>4} | {r['rel']:>4.1f} | {r['precision']:>10.3f} | {r['recall']:>10.3f} | {r['f1']:>10.3f}"
+                  f" | {r.get('fitness', float('nan')):>10.3f} | {r.get('replay_precision', float('nan')):>10.3f}")
 
+        print("\n=== PARETO FRONT (precision, recall, places, flows) ===")
+        print(f"{'abs':>4} | {'rel':>4} | {'Precision':>10} | {'Recall':>10} | {'Places':>7} | {'Flows':>7} | {'Time (ms)':>10}")
+        print("-" * 72)
+        for r in front:
+            print(f"{r['abs']:>4} | {r['rel']:>4.1f} | {r['precision']:>10.3f} | {r['recall']:>10.3f}"
+                  f" | {r['places']:>7} | {r['flows']:>7} | {r['mining_time'] * 1000:>10.2f}")
 
     print(f"\nBest configuration for {dataset_name}: abs={best['abs']}, rel={best['rel']}, F1={best['f1']:.3f}")
     elapsed = time.time() - start_time
@@ -59,6 +105,9 @@ def run_alpha_experiment(dataset_name, log_path, abs_values, rel_values, verbose
         "dataset": dataset_name,
         "results": results_sorted,
         "best": best,
+        "pareto_front": front,
+        "objectives": objectives,
+        "grid": grid_arrays(results, abs_values, rel_values),
         "elapsed": elapsed
     }
 
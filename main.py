@@ -1,7 +1,25 @@
+"""
+Command-line driver for the full pipeline.
+
+Examples:
+    python main.py                                   # everything, default grid, all datasets
+    python main.py --datasets "BPI*" --workers 4     # only the BPI log
+    python main.py --stages report                   # only rebuild the HTML report
+    python main.py --abs 1:5 --rel 0:0.3:0.1 --dry-run
+    python main.py --datasets L1.xes --profile outputs/profile   # cProfile every stage
+"""
+
+import argparse
+import asyncio
 import os
-import yaml
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from fnmatch import fnmatch
+from functools import partial
 
 from evaluate import (
+    evaluate_native_alpha,
+    evaluate_native_heuristics,
     evaluate_pm4py_alpha,
     evaluate_pm4py_heuristics,
     evaluate_custom_alpha
@@ -11,165 +29,466 @@ from alpha_miner import AlphaMinerFrequencies
 from visualize import visualize_model
 from utils.gold_standards import standards
 from generate_html_from_yaml import generate_html_from_yaml
-from visualize_gold_standards import visualize_all_gold_standards
-
-def to_serializable(obj):
-    """Helper function for export_results_to_yaml"""
-    if isinstance(obj, tuple):
-        return list(obj)
-    if isinstance(obj, list):
-        return [to_serializable(x) for x in obj]
-    if isinstance(obj, dict):
-        return {k: to_serializable(v) for k, v in obj.items()}
-    return obj
+from visualize_gold_standards import gold_standard_job
+from utils.lifecycle_log import LIFECYCLE_POLICIES
+from utils.log_cache import CACHE_DIR_ENV, is_cached, load_log, memory_entries
+from utils.profiling import PIPELINE_GROUP, PROFILE_ENV, dump, group, print_hot_functions, print_timings, reset, stage
+from utils.render import is_up_to_date, render_all
+from utils.results_io import RESULT_FORMATS, read_latest_results, write_results
+
+STAGES = ("search", "baselines", "render", "report")
+
+# total 110 param combos
+DEFAULT_ABS_VALUES = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10] # 10
+DEFAULT_REL_VALUES = [0.00, 0.05, 0.10, 0.15, 0.20, 0.25, 0.30, 0.35, 0.40, 0.45, 0.50] # 11
+
+def results_base_path(dataset: str) -> str:
+    return f"outputs/yamls/{dataset.replace('.xes', '')}_results"
+
+def grid_path(dataset: str) -> str:
+    """Full grid search metrics of a dataset (utils.grid_arrays), next to its results file."""
+    return f"outputs/yamls/{dataset.replace('.xes', '')}_grid.npz"
+
+def evaluation_section(result):
+    """Metrics part of an evaluation result, as stored in the results file."""
+    return {key: result[key] for key in ("precision", "recall", "f1", "tp", "fp", "fn", "tn")}
 
 def export_results_to_yaml(dataset, search_results, best_result, default_result,
-                           alpha_result, heuristics_result, miner):
-    """Save experiment results and model configuration to a YAML file."""
+                           alpha_result, heuristics_result, miner, fmt="yaml", baseline_source=None):
+    """
+    Save experiment results and model configuration to a results file.
 
-    file_path = f"outputs/yamls/{dataset.replace('.xes', '')}_results.yaml"
+    `fmt` is "yaml" (default), "json" or "msgpack" (see utils.results_io);
+    the report reads whichever format is present.
+    Sections whose result is None (stage not run) are kept from the previous
+    results file of the dataset, if any. The metrics of every grid cell go to a
+    separate .npz file (grid_path), referenced by "grid_file". `baseline_source`
+    ("native" or "pm4py") records how the baselines were computed.
+    """
 
-    export_data = {
-        "dataset": dataset,
-        "best_parameters": {
+    base_path = results_base_path(dataset)
+
+    export_data = {"dataset": dataset}
+    if search_results is not None:
+        export_data["best_parameters"] = {
             "abs_threshold": search_results["best"]["abs"],
             "rel_threshold": search_results["best"]["rel"],
             "f1": search_results["best"]["f1"],
-        },
-        "top_10_combinations": search_results["results"][:10],
-        "evaluation_custom": {
-            "precision": best_result["precision"],
-            "recall": best_result["recall"],
-            "f1": best_result["f1"],
-            "tp": best_result["tp"],
-            "fp": best_result["fp"],
-            "fn": best_result["fn"],
-            "tn": best_result["tn"],
-        },
-        "evaluation_default": {
-            "precision": default_result["precision"],
-            "recall": default_result["recall"],
-            "f1": default_result["f1"],
-            "tp": default_result["tp"],
-            "fp": default_result["fp"],
-            "fn": default_result["fn"],
-            "tn": default_result["tn"],
-        },
-        "evaluation_alpha": {
-            "precision": alpha_result["precision"],
-            "recall": alpha_result["recall"],
-            "f1": alpha_result["f1"],
-            "tp": alpha_result["tp"],
-            "fp": alpha_result["fp"],
-            "fn": alpha_result["fn"],
-            "tn": alpha_result["tn"],
-        },
-        "evaluation_heuristic": {
-            "precision": heuristics_result["precision"],
-            "recall": heuristics_result["recall"],
-            "f1": heuristics_result["f1"],
-            "tp": heuristics_result["tp"],
-            "fp": heuristics_result["fp"],
-            "fn": heuristics_result["fn"],
-            "tn": heuristics_result["tn"],
-        },
-        "relations_found": list(map(list, best_result["relations"])),
-        "configured_net": {
+        }
+        for key in ("fitness", "replay_precision"):
+            if key in search_results["best"]:
+                export_data["best_parameters"][key] = search_results["best"][key]
+        export_data["top_10_combinations"] = search_results["results"][:10]
+        export_data["pareto_front"] = search_results["pareto_front"]
+        if "grid" in search_results:
+            from utils.grid_arrays import save_grid
+            export_data["grid_file"] = os.path.basename(save_grid(grid_path(dataset), search_results["grid"]))
+    if best_result is not None:
+        export_data["evaluation_custom"] = evaluation_section(best_result)
+    if default_result is not None:
+        export_data["evaluation_default"] = evaluation_section(default_result)
+    if alpha_result is not None:
+        export_data["evaluation_alpha"] = evaluation_section(alpha_result)
+    if heuristics_result is not None:
+        export_data["evaluation_heuristic"] = evaluation_section(heuristics_result)
+    if baseline_source is not None:
+        export_data["baseline_source"] = baseline_source
+    if best_result is not None:
+        export_data["relations_found"] = list(map(list, best_result["relations"]))
+    if miner is not None:
+        export_data["configured_net"] = {
             "places": miner.P_w,
             "transitions": miner.T_w,
             "flows": miner.F_w,
             "parallel": miner.parallel,
             "causality": miner.causality,
-        },
-    }
+        }
+
+    export_data = {**read_latest_results(base_path), **export_data}
 
-    with open(file_path, "w") as f:
-        yaml.safe_dump(to_serializable(export_data), f, sort_keys=False)
+    file_path = write_results(export_data, base_path, fmt)
 
     print(f"Exported results for {dataset} to {file_path}")
 
-def run_full_analysis_for_dataset(dataset: str, abs_values: list[int], rel_values: list[float], verbose: bool = True):
+def print_evaluation(title, result):
+    """Print the metrics of one evaluation result."""
+    print(f"\n--- {title} ---")
+    print(f"Precision: {result['precision']:.3f}")
+    print(f"Recall:    {result['recall']:.3f}")
+    print(f"F1 Score:  {result['f1']:.3f}")
+    print(f"TP: {result['tp']}  FP: {result['fp']}  FN: {result['fn']}  TN: {result['tn']}")
+
+def analyse_dataset(dataset: str, abs_values: list[int], rel_values: list[float], stages=STAGES, data_dir="data",
+                    lifecycle=None, pm4py_baselines=False) -> dict:
+    """
+    Run the compute stages for one dataset: search, baselines and the best model.
+
+    Returns a dict with the results of the stages that ran (None otherwise) and the
+    render job of the best model, for export_dataset and print_dataset_summary.
+    Without the search stage the best parameters are taken from the dataset's previous
+    results file. `lifecycle` is the custom miner's lifecycle policy (the baselines always
+    use complete events). The Alpha and Heuristics baselines are computed natively
+    (baselines.py) unless `pm4py_baselines` is set.
+    """
     print(f"\n\n============================")
     print(f"Dataset: {dataset}")
     print("============================")
 
-    log_path = f"data/{dataset}"
+    log_path = os.path.join(data_dir, dataset)
+    search_results = best_result = default_result = alpha_result = heuristics_result = None
+    abs_best = rel_best = None
 
     ### 1. first do a Grid search
-    search_results = run_alpha_experiment(dataset, log_path, abs_values, rel_values)
-    best = search_results["best"]
-    abs_best = best["abs"]
-    rel_best = best["rel"]
-
-    ### 2. Retrieve results
-    best_result = evaluate_custom_alpha(dataset, log_path, abs_best, rel_best)
-    default_result = evaluate_custom_alpha(dataset, log_path, abs_threshold=0, rel_threshold=0.0)
-    alpha_result = evaluate_pm4py_alpha(dataset, log_path)
-    heuristics_result = evaluate_pm4py_heuristics(dataset, log_path)
-
-    ### 3. Visualize best model
-    miner = AlphaMinerFrequencies(abs_best, rel_best)
-    miner.run(log_path)
-    output_file = f"outputs/models/{dataset.replace('.xes', '')}_best_model"
-    visualize_model(miner, output_file)
-
-    ### 4. Export YAML results
-    export_results_to_yaml(dataset, search_results, best_result, default_result,
-                           alpha_result, heuristics_result, miner)
-
-    ### 5. Print Summary if verbose
+    if "search" in stages:
+        with stage("search"):
+            search_results = run_alpha_experiment(dataset, log_path, abs_values, rel_values, lifecycle=lifecycle)
+            best = search_results["best"]
+            abs_best = best["abs"]
+            rel_best = best["rel"]
+
+            best_result = evaluate_custom_alpha(dataset, log_path, abs_best, rel_best, lifecycle=lifecycle)
+            default_result = evaluate_custom_alpha(dataset, log_path, abs_threshold=0, rel_threshold=0.0,
+                                                   lifecycle=lifecycle)
+    else:
+        params = read_latest_results(results_base_path(dataset)).get("best_parameters", {})
+        abs_best, rel_best = params.get("abs_threshold"), params.get("rel_threshold")
+
+    ### 2. Retrieve baseline results
+    baseline_source = None
+    if "baselines" in stages:
+        baseline_source = "pm4py" if pm4py_baselines else "native"
+        with stage("baselines"):
+            if pm4py_baselines:
+                alpha_result = evaluate_pm4py_alpha(dataset, log_path)
+                heuristics_result = evaluate_pm4py_heuristics(dataset, log_path)
+            else:
+                alpha_result = evaluate_native_alpha(dataset, log_path)
+                heuristics_result = evaluate_native_heuristics(dataset, log_path)
+
+    ### 3. Build the best model diagram (rendered separately)
+    miner = render_job = None
+    if "search" in stages or "render" in stages:
+        if abs_best is None:
+            print(f"No best parameters known for {dataset}; run the search stage first.")
+        else:
+            with stage("model"):
+                miner = AlphaMinerFrequencies(abs_best, rel_best, lifecycle=lifecycle)
+                miner.run(log_path)
+                if "render" in stages:
+                    output_file = f"outputs/models/{dataset.replace('.xes', '')}_best_model"
+                    render_job = visualize_model(miner, output_file, render=False)
+
+    return {
+        "dataset": dataset,
+        "stages": stages,
+        "abs_best": abs_best,
+        "rel_best": rel_best,
+        "search_results": search_results,
+        "best_result": best_result,
+        "default_result": default_result,
+        "alpha_result": alpha_result,
+        "heuristics_result": heuristics_result,
+        "baseline_source": baseline_source,
+        "miner": miner,
+        "render_job": render_job,
+    }
+
+def export_dataset(run: dict, fmt="yaml"):
+    """Step 4 of a dataset run: export its results (sections of stages that did not run are kept)."""
+    stages = run["stages"]
+    if "search" in stages or "baselines" in stages:
+        with stage("export"):
+            export_results_to_yaml(run["dataset"], run["search_results"], run["best_result"], run["default_result"],
+                                   run["alpha_result"], run["heuristics_result"],
+                                   run["miner"] if "search" in stages else None, fmt=fmt,
+                                   baseline_source=run["baseline_source"])
+
+def print_dataset_summary(run: dict):
+    """Step 5 of a dataset run: print its evaluation summary."""
+    dataset = run["dataset"]
+    print(f"\n === Evaluation Summary for {dataset} ===")
+    print(f"→ Gold standard relations: {len(standards[dataset].direct_succession)}")
+    if run["abs_best"] is not None:
+        print(f"→ Best config: abs={run['abs_best']}, rel={run['rel_best']:.2f}")
+    for title, key in (("Best Custom Miner", "best_result"),
+                       ("Default (0, 0) Custom Miner", "default_result"),
+                       ("Alpha Miner baseline", "alpha_result"),
+                       ("Heuristics Miner baseline", "heuristics_result")):
+        if run[key] is not None:
+            print_evaluation(title, run[key])
+
+def dataset_group(dataset: str) -> str:
+    """Profiling group (and profile folder) of a dataset's stages."""
+    return os.path.splitext(dataset)[0]
+
+def finish_dataset_timings(dataset: str, verbose=True):
+    """Print a dataset's stage timings, write its profiles (when enabled) and forget them."""
     if verbose:
+        print_timings(f"Stage timings for {dataset}", group=dataset_group(dataset))
+    dump(group=dataset_group(dataset))
+    reset(dataset_group(dataset))
 
-        print(f"\n === Evaluation Summary for {dataset} ===")
-        print(f"→ Gold standard relations: {len(standards[dataset].direct_succession)}")
-        print(f"→ Best config: abs={abs_best}, rel={rel_best:.2f}")
-        print("\n--- Best Custom Miner ---")
-        print(f"Precision: {best_result['precision']:.3f}")
-        print(f"Recall:    {best_result['recall']:.3f}")
-        print(f"F1 Score:  {best_result['f1']:.3f}")
-        print(f"TP: {best_result['tp']}  FP: {best_result['fp']}  FN: {best_result['fn']}  TN: {best_result['tn']}")
+def run_full_analysis_for_dataset(dataset: str, abs_values: list[int], rel_values: list[float], verbose: bool = True,
+                                  stages=STAGES, data_dir="data", fmt="yaml", lifecycle=None, pm4py_baselines=False):
+    """
+    Run the selected pipeline stages for one dataset, one after the other.
 
-        print("\n--- Default (0, 0) Custom Miner ---")
-        print(f"Precision: {default_result['precision']:.3f}")
-        print(f"Recall:    {default_result['recall']:.3f}")
-        print(f"F1 Score:  {default_result['f1']:.3f}")
-        print(f"TP: {default_result['tp']}  FP: {default_result['fp']}  FN: {default_result['fn']}  TN: {default_result['tn']}")
+    Returns the render job of its best model (rendered later, in a batch), or
+    None when the render stage is not selected. See analyse_dataset for the options.
+    """
+    with group(dataset_group(dataset)):
+        run = analyse_dataset(dataset, abs_values, rel_values, stages=stages, data_dir=data_dir,
+                              lifecycle=lifecycle, pm4py_baselines=pm4py_baselines)
+        export_dataset(run, fmt)
+    if verbose:
+        print_dataset_summary(run)
 
-        print("\n--- PM4Py Alpha Miner ---")
-        print(f"Precision: {alpha_result['precision']:.3f}")
-        print(f"Recall:    {alpha_result['recall']:.3f}")
-        print(f"F1 Score:  {alpha_result['f1']:.3f}")
-        print(f"TP: {alpha_result['tp']}  FP: {alpha_result['fp']}  FN: {alpha_result['fn']}  TN: {alpha_result['tn']}")
+    # Profiles (when enabled) go to one folder per dataset
+    finish_dataset_timings(dataset, verbose)
+    return run["render_job"]
 
-        print("\n--- PM4Py Heuristics Miner ---")
-        print(f"Precision: {heuristics_result['precision']:.3f}")
-        print(f"Recall:    {heuristics_result['recall']:.3f}")
-        print(f"F1 Score:  {heuristics_result['f1']:.3f}")
-        print(f"TP: {heuristics_result['tp']}  FP: {heuristics_result['fp']}  FN: {heuristics_result['fn']}  TN: {heuristics_result['tn']}")
+def prefetch_logs(dataset: str, stages=STAGES, data_dir="data", lifecycle=None, pm4py_baselines=False):
+    """Parse the logs a run of `dataset` will read into the log cache (the pipeline does this ahead of time)."""
+    log_path = os.path.join(data_dir, dataset)
+    if not os.path.exists(log_path):
+        return
+    if "search" in stages or "render" in stages:
+        load_log(log_path, lifecycle=lifecycle)
+    if "baselines" in stages and not pm4py_baselines:
+        load_log(log_path, sort_by_timestamp=True)
 
+async def run_pipeline(datasets, abs_values, rel_values, verbose=True, stages=STAGES, data_dir="data", fmt="yaml",
+                       lifecycle=None, pm4py_baselines=False, prefetch=1, render_workers=None):
+    """
+    Run all datasets as an asyncio pipeline: parse -> analyse -> export and render.
 
+    The stages are connected by queues of `prefetch` datasets. While one dataset is
+    analysed, the logs of the next are parsed in a thread (into the log cache), and the
+    results of the previous one are written and its diagrams (best model and gold
+    standard) rendered by Graphviz subprocesses. Analysis runs on one dedicated thread,
+    in dataset order, so the console output of a dataset stays together.
 
-if __name__ == "__main__":
+    Each dataset's stages are timed (and profiled) in its own group; its timings are
+    printed and its profiles written once its diagrams are rendered. A failed render is
+    reported and does not stop the other datasets. Returns the image paths that
+    could not be rendered.
+    """
+    loop = asyncio.get_running_loop()
+    parsed, analysed = asyncio.Queue(prefetch), asyncio.Queue(prefetch)
+    renders = asyncio.Semaphore(render_workers or os.cpu_count() or 1)
+    finish_tasks = []
+    failed_renders = []
+    options = {"stages": stages, "data_dir": data_dir, "lifecycle": lifecycle, "pm4py_baselines": pm4py_baselines}
+
+    async def parse():
+        for dataset in datasets:
+            await asyncio.to_thread(prefetch_logs, dataset, **options)
+            await parsed.put(dataset)
+        await parsed.put(None)
+
+    def analyse_in_group(dataset):
+        # run_in_executor does not carry the context, so the group is set in the analysis thread
+        with group(dataset_group(dataset)):
+            return analyse_dataset(dataset, abs_values, rel_values, **options)
+
+    async def analyse(executor):
+        while (dataset := await parsed.get()) is not None:
+            run = await loop.run_in_executor(executor, analyse_in_group, dataset)
+            await analysed.put(run)
+        await analysed.put(None)
 
-    # total 110 param combos
-    abs_values = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10] # 10
-    rel_values = [0.00, 0.05, 0.10, 0.15, 0.20, 0.25, 0.30, 0.35, 0.40, 0.45, 0.50] # 11
+    def render_jobs(jobs):
+        with stage("render"):
+            return render_all(jobs)[2]
+
+    async def finish(run):
+        """Render the dataset's diagrams, then print and write its timings and profiles."""
+        jobs = [job for job in (run["render_job"], gold_standard_job(standards[run["dataset"]])) if job is not None]
+        if "render" in stages and jobs:
+            async with renders:
+                failed_renders.extend(await asyncio.to_thread(render_jobs, jobs))
+        finish_dataset_timings(run["dataset"], verbose)
+
+    async def write():
+        while (run := await analysed.get()) is not None:
+            # Tasks and threads started here inherit the dataset's profiling group
+            with group(dataset_group(run["dataset"])):
+                await asyncio.to_thread(export_dataset, run, fmt)
+                if verbose:
+                    print_dataset_summary(run)
+                finish_tasks.append(asyncio.create_task(finish(run)))
+
+    # Each dataset reads up to 3 cached logs (a lifecycle log, its view, the timestamp-sorted log)
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="analyse") as executor, \
+            memory_entries(3 * (prefetch + 2)):
+        await asyncio.gather(parse(), analyse(executor), write())
+        await asyncio.gather(*finish_tasks)
+    return failed_renders
+
+def parse_grid(spec: str, cast=float) -> list:
+    """
+    Parse a grid axis: a comma list ("1,2,5") or an inclusive range ("start:stop[:step]").
+
+    With cast=int every value (and the range's start, stop and step) must be a whole number.
+    """
+    def check(values):
+        if cast is int and any(v != int(v) for v in values):
+            raise argparse.ArgumentTypeError(f"Grid values must be integers in {spec!r}")
+        return values
+
+    if ":" not in spec:
+        return [cast(v) for v in check([float(v) for v in spec.split(",") if v.strip()])]
+
+    parts = check([float(v) for v in spec.split(":")])
+    if len(parts) not in (2, 3):
+        raise argparse.ArgumentTypeError(f"Invalid grid range {spec!r}, expected start:stop[:step]")
+    start, stop, step = parts[0], parts[1], parts[2] if len(parts) == 3 else 1
+    if step <= 0:
+        raise argparse.ArgumentTypeError(f"Grid step must be positive in {spec!r}")
+
+    values = []
+    i = 0
+    while start + i * step <= stop + 1e-9:
+        values.append(cast(round(start + i * step, 10)))
+        i += 1
+    return values
+
+def select_datasets(patterns=None, exclude=None) -> list:
+    """Gold standard datasets matching any of the (fnmatch) patterns, with or without the .xes suffix."""
+    def matches(dataset, pats):
+        return any(fnmatch(dataset, p) or fnmatch(dataset.replace(".xes", ""), p) for p in pats)
+
+    datasets = list(standards.keys())
+    if patterns:
+        datasets = [d for d in datasets if matches(d, patterns)]
+    if exclude:
+        datasets = [d for d in datasets if not matches(d, exclude)]
+    return datasets
+
+def print_work_estimate(datasets, abs_values, rel_values, stages, data_dir, pm4py_baselines=False):
+    """Print how much work a run would do, without doing it."""
+    n_cells = len(abs_values) * len(rel_values)
+    print(f"Stages:   {', '.join(stages)}")
+    print(f"Grid:     {len(abs_values)} abs x {len(rel_values)} rel = {n_cells} cells")
+    print(f"Datasets: {len(datasets)}\n")
+
+    total_bytes = n_miner_runs = n_parses = n_pm4py_runs = 0
+    print(f"{'dataset':<28} {'log size':>10} {'parsed log':>11} {'miner runs':>11} {'PM4Py runs':>11}")
+    for dataset in datasets:
+        log_path = os.path.join(data_dir, dataset)
+        exists = os.path.exists(log_path)
+        size = os.path.getsize(log_path) if exists else 0
+        cached = exists and is_cached(log_path)
+
+        miner_runs = (n_cells + 2 if "search" in stages else 0) + ("render" in stages)
+        pm4py_runs = 2 if "baselines" in stages and pm4py_baselines else 0
+        native_parse = (exists and "baselines" in stages and not pm4py_baselines
+                        and not is_cached(log_path, sort_by_timestamp=True))
+        total_bytes += size
+        n_miner_runs += miner_runs
+        n_pm4py_runs += pm4py_runs
+        if exists:
+            n_parses += (miner_runs > 0 and not cached) + pm4py_runs + native_parse
+
+        status = "missing" if not exists else ("cached" if cached else "to parse")
+        print(f"{dataset:<28} {size / 1e6:>8.1f}MB {status:>11} {miner_runs:>11} {pm4py_runs:>11}")
+
+    print(f"\nTotal: {total_bytes / 1e6:.1f} MB of logs, {n_parses} XES parses, "
+          f"{n_miner_runs} custom miner runs, {n_pm4py_runs} PM4Py runs")
+    if "render" in stages:
+        stale = sum(not is_up_to_date(gold_standard_job(standards[d])) for d in datasets)
+        print(f"Renders: up to {len(datasets)} best models + {stale} gold standards")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Frequency-based Alpha Miner experiment pipeline.")
+    parser.add_argument("--datasets", nargs="+", metavar="PATTERN",
+                        help="only these datasets (names or glob patterns, .xes optional); default: all")
+    parser.add_argument("--exclude", nargs="+", metavar="PATTERN", help="skip these datasets")
+    parser.add_argument("--abs", dest="abs_values", type=partial(parse_grid, cast=int), default=DEFAULT_ABS_VALUES,
+                        help="absolute thresholds: comma list or start:stop[:step] (default: 1:10)")
+    parser.add_argument("--rel", dest="rel_values", type=parse_grid, default=DEFAULT_REL_VALUES,
+                        help="relative thresholds: comma list or start:stop[:step] (default: 0:0.5:0.05)")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES),
+                        help="pipeline stages to run (default: all)")
+    parser.add_argument("--prefetch", type=int, default=1, metavar="N",
+                        help="with one worker, parse up to N datasets ahead of the one being analysed while the "
+                             "previous results are exported and rendered; 0 runs the datasets strictly one after "
+                             "the other (default: 1)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="datasets processed in parallel, also used for rendering (default: 1)")
+    parser.add_argument("--cache-dir", help="directory for cached parsed logs (default: in-memory only)")
+    parser.add_argument("--data-dir", default="data", help="folder with the .xes logs (default: data)")
+    parser.add_argument("--lifecycle", choices=LIFECYCLE_POLICIES,
+                        help="lifecycle policy of the custom miner; one parse serves all policies "
+                             "(default: complete events, read directly)")
+    parser.add_argument("--pm4py-baselines", action="store_true",
+                        help="run the Alpha / Heuristics baselines with PM4Py instead of the native matrix versions")
+    parser.add_argument("--format", choices=tuple(RESULT_FORMATS), default="yaml", help="results file format")
+    parser.add_argument("--verbose", action="store_true", help="print an evaluation summary per dataset")
+    parser.add_argument("--profile", metavar="DIR",
+                        help="cProfile every pipeline stage and write .prof / .folded files to DIR")
+    parser.add_argument("--profile-top", type=int, default=20, metavar="N",
+                        help="with --profile, print the N functions with the most own time (default: 20)")
+    parser.add_argument("--dry-run", action="store_true", help="print the estimated work and exit")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    stages = [s for s in STAGES if s in args.stages]
+    datasets = select_datasets(args.datasets, args.exclude)
+
+    # Worker processes inherit the cache location through the environment
+    if args.cache_dir:
+        os.environ[CACHE_DIR_ENV] = args.cache_dir
+    if args.profile:
+        os.environ[PROFILE_ENV] = args.profile
+    run_start = time.time()
+
+    if args.dry_run:
+        print_work_estimate(datasets, args.abs_values, args.rel_values, stages, args.data_dir, args.pm4py_baselines)
+        return
 
     # make directories to write to
     os.makedirs("outputs/yamls", exist_ok=True)
     os.makedirs("outputs/models", exist_ok=True)
 
-    # retrieve all dataset names
-    datasets = list(standards.keys())
-
     # Parse the datasets
-    for dataset in datasets:
-        run_full_analysis_for_dataset(dataset, abs_values, rel_values, verbose=False)
+    options = dict(abs_values=args.abs_values, rel_values=args.rel_values, verbose=args.verbose, stages=stages,
+                   data_dir=args.data_dir, fmt=args.format, lifecycle=args.lifecycle,
+                   pm4py_baselines=args.pm4py_baselines)
+    run_dataset = partial(run_full_analysis_for_dataset, **options)
+    render_jobs, failed_renders = [], []
+    if {"search", "baselines", "render"} & set(stages):
+        if args.workers > 1 and len(datasets) > 1:
+            with ProcessPoolExecutor(max_workers=args.workers) as pool:
+                render_jobs = list(pool.map(run_dataset, datasets))
+        elif args.prefetch > 0:
+            # The pipeline renders the diagrams of each dataset as soon as it is analysed
+            failed_renders = asyncio.run(run_pipeline(datasets, prefetch=args.prefetch, **options))
+            render_jobs = None
+        else:
+            render_jobs = [run_dataset(dataset) for dataset in datasets]
 
     # Update the html report
-    generate_html_from_yaml()
+    if "report" in stages:
+        with stage("report"):
+            generate_html_from_yaml()
 
-    # Visualize the gold standards
-    visualize_all_gold_standards()
+    # Visualize the best models and the gold standards (concurrently, unchanged diagrams are skipped)
+    if "render" in stages and render_jobs is not None:
+        render_jobs = [job for job in render_jobs if job is not None]
+        render_jobs += [gold_standard_job(standards[dataset]) for dataset in datasets]
+        with stage("render"):
+            failed_renders = render_all(render_jobs, workers=args.workers if args.workers > 1 else None)[2]
 
-    print("\n\nAll datasets processed successfully.")
+    dump(group=PIPELINE_GROUP)
+    if args.profile:
+        print_hot_functions(top=args.profile_top, since=run_start)
+    if failed_renders:
+        print(f"\n\nAll datasets processed; these diagrams could not be rendered: {', '.join(failed_renders)}.")
+    else:
+        print("\n\nAll datasets processed successfully.")
+
+
+if __name__ == "__main__":
+    main()
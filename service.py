@@ -0,0 +1,367 @@
+"""
+Local mining service: a long-lived process that keeps counted logs in memory, so repeated requests
+("mine dataset X at (abs, rel)", "evaluate it against the gold standard") skip the interpreter start-up,
+the imports and the XES parsing, and answer in milliseconds.
+
+Requests are JSON over HTTP on localhost (asyncio, stdlib only):
+
+    GET  /health
+    GET  /stats                                        cache contents and memory use
+    POST /mine      {"dataset": "L1.xes", "abs": 1, "rel": 0.1}
+    POST /evaluate  {"dataset": "L1.xes", "abs": 1, "rel": 0.1, "replay": false}
+
+Logs are looked up in the data folder by file name and cached per file (size and mtime, so an edited log is
+counted again). The least recently used logs are evicted when the estimated memory use exceeds the cap.
+Logs are parsed outside utils.log_cache's in-process memo, so the cached entries are all the service keeps.
+
+Examples:
+    python service.py --port 8765 --memory-mb 512
+    curl -s localhost:8765/mine -d '{"dataset": "L1.xes", "abs": 1, "rel": 0.1}'
+    python service.py --smoke-test L1.xes   # start on a free port, call /health and /mine, stop
+"""
+
+import argparse
+import asyncio
+import http.client
+import json
+import os
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+
+from alpha_miner import AlphaMinerFrequencies, count_traces
+from evaluate import evaluate_custom_alpha
+from utils.gold_standards import standards
+from utils.import_xes import read_xes
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_MEMORY_MB = 512
+MAX_BODY = 1 << 20
+
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+class RequestError(Exception):
+    """A request the service cannot answer; carries the HTTP status."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class LogEntry:
+    """Everything the service keeps for one log."""
+    key: tuple           # (path, size, mtime_ns)
+    counts: tuple        # alpha_miner.count_log result
+    variants: object     # conformance variants Counter, for replay
+    size: int            # estimated bytes
+    tree: object = None  # conformance.PrefixTree, built on the first replay request
+
+
+def estimate_size(counts, variants) -> int:
+    """Rough memory use of a LogEntry in bytes (frequency table, names and variants)."""
+    freq, start_freq, end_freq, activities = counts
+    size = sum(sys.getsizeof(name) for name in freq.table.names)
+    size += len(freq) * (2 * freq.src.itemsize + freq.abs_freq.itemsize + freq.rel_freq.itemsize + freq.loop2.itemsize)
+    size += 200 * (len(start_freq) + len(end_freq))
+    size += sum(sys.getsizeof(variant) + 100 for variant in variants)
+    return size
+
+
+class LogStore:
+    """LRU cache of LogEntry objects under a memory cap; concurrent loads of one log are shared."""
+
+    def __init__(self, data_dir="data", memory_cap=DEFAULT_MEMORY_MB << 20):
+        self.data_dir = data_dir
+        self.memory_cap = memory_cap
+        self.entries = OrderedDict()
+        self.loading = {}
+        self.hits = self.misses = self.evictions = 0
+
+    @property
+    def memory(self):
+        return sum(entry.size for entry in self.entries.values())
+
+    def resolve(self, dataset):
+        """Path of a dataset in the data folder; plain file names only."""
+        if not isinstance(dataset, str) or not dataset or os.path.basename(dataset) != dataset:
+            raise RequestError(400, f"Invalid dataset name {dataset!r}")
+        path = os.path.join(self.data_dir, dataset)
+        if not os.path.isfile(path):
+            raise RequestError(404, f"Unknown dataset {dataset!r}")
+        return path
+
+    async def get(self, dataset) -> LogEntry:
+        path = self.resolve(dataset)
+        stat = os.stat(path)
+        key = (path, stat.st_size, stat.st_mtime_ns)
+
+        entry = self.entries.get(path)
+        if entry is not None and entry.key == key:
+            self.entries.move_to_end(path)
+            self.hits += 1
+            return entry
+
+        # Parse and count in a worker thread; requests for the same log wait for the same load
+        task = self.loading.get(key)
+        if task is None:
+            self.misses += 1
+            task = asyncio.ensure_future(asyncio.to_thread(self._load, key))
+            self.loading[key] = task
+            task.add_done_callback(lambda _: self.loading.pop(key, None))
+        entry = await task
+
+        self.entries[path] = entry
+        self.entries.move_to_end(path)
+        self._evict()
+        return entry
+
+    def _load(self, key):
+        from conformance import log_variants
+
+        # Parsed directly, not through load_log: its memo would hold full logs outside the memory cap
+        path = key[0]
+        log = read_xes(path)
+        counts = count_traces(log.values())
+        if counts is None:
+            raise RequestError(400, f"{os.path.basename(path)} contains no traces")
+        variants = log_variants(log.values())
+        return LogEntry(key, counts, variants, estimate_size(counts, variants))
+
+    def _evict(self):
+        """Drop least recently used logs until under the cap (the newest entry always stays)."""
+        while len(self.entries) > 1 and self.memory > self.memory_cap:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self):
+        return {
+            "logs": [
+                {"dataset": os.path.basename(path), "variants": len(entry.variants), "bytes": entry.size}
+                for path, entry in self.entries.items()
+            ],
+            "memory_bytes": self.memory,
+            "memory_cap_bytes": self.memory_cap,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+def thresholds(body):
+    """(abs, rel) from a request body, with the miner's defaults."""
+    try:
+        return int(body.get("abs", 1)), float(body.get("rel", 0.0))
+    except (TypeError, ValueError):
+        raise RequestError(400, "abs must be an integer and rel a number")
+
+
+def sorted_pairs(pairs):
+    return sorted([a, b] for a, b in pairs)
+
+
+class MiningService:
+    """
+    Request handlers on top of a LogStore.
+
+    Mining runs on one dedicated thread: miners add their place names to the
+    cached log's shared NameTable, which must not be written concurrently.
+    """
+
+    def __init__(self, store: LogStore):
+        self.store = store
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="miner")
+
+    async def run_mining(self, fn, *args, **kwargs):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, partial(fn, *args, **kwargs))
+
+    async def mine(self, body):
+        entry = await self.store.get(body.get("dataset"))
+        abs_t, rel_t = thresholds(body)
+        miner = AlphaMinerFrequencies(abs_threshold=abs_t, rel_threshold=rel_t)
+        await self.run_mining(miner.run_frequencies, *entry.counts)
+        return {
+            "dataset": body["dataset"],
+            "abs": abs_t,
+            "rel": rel_t,
+            "direct_follower": sorted_pairs(miner.direct_follower.pairs()),
+            "causality": sorted_pairs(miner.causality.pairs()),
+            "parallel": sorted_pairs(miner.parallel.pairs()),
+            "places": miner.P_w,
+            "transitions": miner.T_w,
+            "flows": [list(arc) for arc in miner.F_w],
+        }
+
+    async def evaluate(self, body):
+        dataset = body.get("dataset")
+        entry = await self.store.get(dataset)
+        if dataset not in standards:
+            raise RequestError(404, f"No gold standard for {dataset!r}")
+        abs_t, rel_t = thresholds(body)
+
+        replay_tree = None
+        if body.get("replay"):
+            if entry.tree is None:
+                from conformance import build_prefix_tree
+                entry.tree = await asyncio.to_thread(build_prefix_tree, entry.variants)
+            replay_tree = entry.tree
+
+        result = await self.run_mining(evaluate_custom_alpha, dataset, self.store.resolve(dataset), abs_t, rel_t,
+                                       replay_tree=replay_tree, counts=entry.counts)
+        result["relations"] = sorted_pairs(result["relations"])
+        return {"dataset": dataset, "abs": abs_t, "rel": rel_t, **result}
+
+    async def dispatch(self, method, path, body):
+        routes = {
+            ("GET", "/health"): lambda: {"status": "ok"},
+            ("GET", "/stats"): self.store.stats,
+            ("POST", "/mine"): lambda: self.mine(body),
+            ("POST", "/evaluate"): lambda: self.evaluate(body),
+        }
+        handler = routes.get((method, path))
+        if handler is None:
+            if any(route_path == path for _, route_path in routes):
+                raise RequestError(405, f"{method} not allowed on {path}")
+            raise RequestError(404, f"Unknown endpoint {path}")
+        result = handler()
+        return await result if asyncio.iscoroutine(result) else result
+
+
+async def read_request(reader):
+    """Read one HTTP request: (method, path, headers, body), or None when the client closed the connection."""
+    request_line = await reader.readline()
+    if not request_line.strip():
+        return None
+    try:
+        method, path, _ = request_line.decode("latin-1").split()
+    except ValueError:
+        raise RequestError(400, "Malformed request line")
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    length = int(headers.get("content-length", 0) or 0)
+    if length > MAX_BODY:
+        raise RequestError(400, "Request body too large")
+    raw = await reader.readexactly(length) if length else b""
+    try:
+        body = json.loads(raw) if raw else {}
+    except ValueError:
+        raise RequestError(400, "Request body is not valid JSON")
+    if not isinstance(body, dict):
+        raise RequestError(400, "Request body must be a JSON object")
+    return method, path.split("?")[0], headers, body
+
+
+async def handle_connection(service, reader, writer):
+    """Serve requests on one connection (keep-alive) until the client closes it."""
+    try:
+        while True:
+            keep_alive = True
+            start = time.perf_counter()
+            try:
+                request = await read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                keep_alive = headers.get("connection", "keep-alive").lower() != "close"
+                status, payload = 200, await service.dispatch(method, path, body)
+            except RequestError as e:
+                status, payload = e.status, {"error": str(e)}
+            except (asyncio.IncompleteReadError, ConnectionError):
+                break
+            except Exception as e:
+                status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+
+            if isinstance(payload, dict):
+                payload["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 3)
+            data = json.dumps(payload).encode("utf-8")
+            writer.write(
+                f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data
+            )
+            await writer.drain()
+            if not keep_alive:
+                break
+    finally:
+        writer.close()
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, data_dir="data", memory_mb=DEFAULT_MEMORY_MB):
+    """Run the service until cancelled."""
+    service = MiningService(LogStore(data_dir, memory_mb << 20))
+    server = await asyncio.start_server(lambda r, w: handle_connection(service, r, w), host, port)
+    print(f"Mining service on http://{host}:{port} (data: {data_dir}, cache cap: {memory_mb} MB)")
+    async with server:
+        await server.serve_forever()
+
+
+async def smoke_test(dataset="L1.xes", data_dir="data", host=DEFAULT_HOST):
+    """
+    Start the service on a free port, call /health and /mine on `dataset`, and stop it.
+
+    Returns the two responses; raises RuntimeError when either is not the expected answer.
+    """
+    service = MiningService(LogStore(data_dir))
+    server = await asyncio.start_server(lambda r, w: handle_connection(service, r, w), host, 0)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        health = await asyncio.to_thread(request, "/health", host=host, port=port)
+        mined = await asyncio.to_thread(request, "/mine", {"dataset": dataset, "abs": 1, "rel": 0.0},
+                                        host=host, port=port)
+    service.executor.shutdown()
+
+    if health.get("status") != "ok":
+        raise RuntimeError(f"/health answered {health}")
+    if "error" in mined or not mined.get("places"):
+        raise RuntimeError(f"/mine answered {mined}")
+    print(f"Smoke test on port {port}: /health ok, /mine {dataset}: {len(mined['places'])} places, "
+          f"{len(mined['flows'])} flows in {mined['elapsed_ms']} ms")
+    return health, mined
+
+
+def request(path, body=None, host=DEFAULT_HOST, port=DEFAULT_PORT, timeout=60):
+    """Small client: POST `body` (GET without one) to the service and return the decoded JSON response."""
+    conn = http.client.HTTPConnection(host, port, timeout=timeout)
+    try:
+        if body is None:
+            conn.request("GET", path)
+        else:
+            conn.request("POST", path, json.dumps(body), {"Content-Type": "application/json"})
+        return json.loads(conn.getresponse().read())
+    finally:
+        conn.close()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Local Alpha Miner service with a warm log cache.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"interface to bind (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"port (default: {DEFAULT_PORT})")
+    parser.add_argument("--data-dir", default="data", help="folder with the .xes logs (default: data)")
+    parser.add_argument("--memory-mb", type=int, default=DEFAULT_MEMORY_MB,
+                        help=f"cache memory cap in MB (default: {DEFAULT_MEMORY_MB})")
+    parser.add_argument("--smoke-test", metavar="DATASET",
+                        help="start on a free port, call /health and /mine on DATASET, then exit")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.smoke_test:
+        asyncio.run(smoke_test(args.smoke_test, args.data_dir, args.host))
+        sys.exit(0)
+    try:
+        asyncio.run(serve(args.host, args.port, args.data_dir, args.memory_mb))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,154 @@
+"""
+Checkpoints of counted logs, for logs that grow by appending traces.
+
+A checkpoint stores the running direct-follower / start / end counts (alpha_miner.new_counts) together with the
+part of the XES file they cover: everything up to the byte offset just after the last counted </trace>, with the
+number of traces and a fingerprint of that part. When the file still starts with the counted part, only the bytes
+after the offset are parsed, as a small XES document made of the original header (everything before the first
+<trace>), the appended traces and the closing </log>.
+
+The counted traces are kept per case id, so that an appended trace with a case id counted before can replace it
+(read_xes keeps the last trace of a case id too).
+
+The fingerprint hashes the complete counted part by default. With full_check=False it only hashes the header and
+the FINGERPRINT_WINDOW bytes before the offset, which does not read the whole file but misses an edit in the middle
+of the counted part.
+"""
+
+import hashlib
+import mmap
+import os
+import pickle
+import re
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+CHECKPOINT_VERSION = 3
+FINGERPRINT_WINDOW = 1 << 20
+TRACE_START = re.compile(rb"<trace[\s>/]")
+TRACE_END = b"</trace>"
+LOG_START = re.compile(rb"<(\w+:)?log[\s>]")
+
+
+@dataclass
+class LogCheckpoint:
+    options: dict          # count options the counts were made with (sort_by_timestamp, lifecycle)
+    counts: tuple          # alpha_miner.new_counts() structure
+    n_traces: int = 0      # traces counted
+    cases: dict = field(default_factory=dict)  # {case_id: (activities, ...)} of the counted traces
+    header_end: int = 0    # bytes before the first <trace>
+    offset: int = 0        # bytes counted: up to just after the last counted </trace>
+    fingerprint: str = ""
+    version: int = CHECKPOINT_VERSION
+
+
+def checkpoint_path(path):
+    """Default checkpoint file of a log: next to it."""
+    return f"{path}.checkpoint"
+
+
+def load_checkpoint(file, options):
+    """The checkpoint in `file` if it exists, is readable and was made with the same options; else None."""
+    try:
+        with open(file, "rb") as f:
+            checkpoint = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        return None
+    if not isinstance(checkpoint, LogCheckpoint) or checkpoint.version != CHECKPOINT_VERSION:
+        return None
+    return checkpoint if checkpoint.options == options else None
+
+
+def save_checkpoint(file, checkpoint):
+    """Write a checkpoint atomically."""
+    directory = os.path.dirname(file)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp = f"{file}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump(checkpoint, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, file)
+
+
+@contextmanager
+def mapped(path):
+    """Read-only mmap of a file (empty bytes for an empty file, which mmap cannot map)."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            yield data
+
+
+def trace_bounds(path):
+    """(header_end, offset): bytes before the first <trace> and up to just after the last </trace>; (0, 0) if none."""
+    with mapped(path) as data:
+        first = TRACE_START.search(data)
+        last = data.rfind(TRACE_END)
+    if first is None or last < 0:
+        return 0, 0
+    return first.start(), last + len(TRACE_END)
+
+
+def fingerprint(path, header_end, offset, full=True):
+    """Hash of the first `offset` bytes of a file (with full=False: its header and last FINGERPRINT_WINDOW bytes)."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(offset.to_bytes(8, "little"))
+    with mapped(path) as data:
+        if len(data) < offset:
+            return ""
+        if full:
+            h.update(data[:offset])
+        else:
+            h.update(data[:header_end])
+            h.update(data[max(header_end, offset - FINGERPRINT_WINDOW):offset])
+    return h.hexdigest()
+
+
+def is_prefix(checkpoint: LogCheckpoint, path, header_end, full_check=True) -> bool:
+    """True when the file still starts with the part counted in `checkpoint`."""
+    return (checkpoint.offset > 0 and header_end == checkpoint.header_end and
+            fingerprint(path, header_end, checkpoint.offset, full_check) == checkpoint.fingerprint)
+
+
+class TraceRange:
+    """
+    Readable file object with a XES document holding only the traces in bytes [start, stop) of a log:
+    the log's header, those bytes and a closing </log>. The streaming parsers
+    (utils.import_xes.iter_xes) read it like a file; a trace still being written
+    after `stop` is not included.
+    """
+
+    def __init__(self, path, header_end, start, stop):
+        self.file = open(path, "rb")
+        header = self.file.read(header_end)
+        root = LOG_START.search(header)
+        prefix = (root.group(1) or b"") if root else b""
+        self.parts = [header, None, b"</" + prefix + b"log>"]
+        self.file.seek(start)
+        self.remaining = stop - start
+
+    def read(self, n=-1):
+        while self.parts:
+            if self.parts[0] is None:
+                size = self.remaining if n < 0 else min(n, self.remaining)
+                chunk = self.file.read(size)
+                self.remaining -= len(chunk)
+                if chunk:
+                    return chunk
+            elif self.parts[0]:
+                part = self.parts[0]
+                chunk, self.parts[0] = (part, b"") if n < 0 else (part[:n], part[n:])
+                return chunk
+            self.parts.pop(0)
+        return b""
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
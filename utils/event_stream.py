@@ -0,0 +1,167 @@
+"""
+Out-of-core input for event streams: logs exported as one row per event, sorted by timestamp, with the events of
+different cases interleaved (so they cannot be grouped into {case_id: [activities]} without holding the whole log).
+
+- iter_csv_events: stream (case_id, activity) from a CSV event table, in file order
+- CaseStateStore:  last activity per open case, kept in memory up to a budget; the least recently active cases are
+                   spilled to an SQLite file and read back when they become active again
+
+Direct-follower counting needs nothing more per case than its last activity, so memory stays bounded by the
+budget plus the (activities x activities) counts, whatever the number of events or cases.
+"""
+
+import csv
+import os
+import sqlite3
+import sys
+import tempfile
+from collections import OrderedDict
+
+from utils.import_xes import parse_timestamp
+from utils.lifecycle_log import filter_trace
+
+DEFAULT_MEMORY_MB = 256
+# Estimated bytes per in-memory case besides its id string (OrderedDict entry, links, int)
+ENTRY_OVERHEAD = 120
+# Spill down to this fraction of the budget, so spills happen in batches
+SPILL_TARGET = 0.75
+
+
+def iter_csv_events(path, case_col="case:concept:name", activity_col="concept:name",
+                    timestamp_col="time:timestamp", lifecycle_col="lifecycle:transition", lifecycle="complete"):
+    """
+    Stream (case_id, activity) from a CSV event table without loading it.
+
+    Column defaults match PM4Py's names. Rows without a case or an activity are skipped,
+    and activity names get underscores like read_xes. When the lifecycle column exists,
+    the `lifecycle` policy is applied per event (see utils/lifecycle_log.py). When the
+    timestamp column exists, the rows must be in timestamp order (ValueError otherwise):
+    the counts are only right if every case's events come in time order.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        columns = {name: i for i, name in enumerate(header)}
+        case_i, activity_i = columns[case_col], columns[activity_col]
+        lifecycle_i = columns.get(lifecycle_col)
+        timestamp_i = columns.get(timestamp_col)
+
+        previous = None
+        for row in reader:
+            case_id, activity = row[case_i], row[activity_i]
+            if not case_id or not activity:
+                continue
+            if timestamp_i is not None:
+                timestamp = parse_timestamp(row[timestamp_i])
+                if timestamp is not None:
+                    if previous is not None and timestamp < previous:
+                        raise ValueError(f"{path}: row {reader.line_num} is not in timestamp order")
+                    previous = timestamp
+            activity = activity.replace(" ", "_")
+            if lifecycle_i is not None:
+                value = row[lifecycle_i].lower() or None
+                activity = filter_trace([activity], [value], lifecycle)
+                if not activity:
+                    continue
+                activity = activity[0]
+            yield case_id, activity
+
+
+class CaseStateStore:
+    """
+    {case_id: int state} with a memory budget; the least recently active cases spill to SQLite.
+
+    `pop` takes a case out of the store (memory or disk), `put` stores it as most recently
+    active, and `items` yields every stored case once (memory first, then disk). The
+    spill file lives in `spill_dir` (default: the system temp folder) and is deleted on close.
+    """
+
+    def __init__(self, memory_mb=DEFAULT_MEMORY_MB, spill_dir=None):
+        self.budget = int(memory_mb * (1 << 20))
+        self.memory = OrderedDict()
+        self.size = 0
+        self.spill_dir = spill_dir
+        self.db = self.path = None
+        self.on_disk = 0
+        self.spilled = self.reloaded = self.peak_cases = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self.memory) + self.on_disk
+
+    @staticmethod
+    def entry_size(case_id):
+        return sys.getsizeof(case_id) + ENTRY_OVERHEAD
+
+    def pop(self, case_id, default=None):
+        """Remove a case and return its state (`default` if unknown)."""
+        state = self.memory.pop(case_id, None)
+        if state is not None:
+            self.size -= self.entry_size(case_id)
+            return state
+        if not self.on_disk:
+            return default
+        row = self.db.execute("DELETE FROM cases WHERE case_id = ? RETURNING state", (case_id,)).fetchone()
+        if row is None:
+            return default
+        self.on_disk -= 1
+        self.reloaded += 1
+        return row[0]
+
+    def put(self, case_id, state):
+        """Store a case as the most recently active one (it must not be stored already: pop it first)."""
+        self.memory[case_id] = state
+        self.size += self.entry_size(case_id)
+        if self.size > self.budget:
+            self.spill()
+        self.peak_cases = max(self.peak_cases, len(self))
+
+    def spill(self):
+        """Move the least recently active cases to disk until memory use is below SPILL_TARGET of the budget."""
+        if self.db is None:
+            fd, self.path = tempfile.mkstemp(suffix=".sqlite", prefix="case_state_", dir=self.spill_dir)
+            os.close(fd)
+            self.db = sqlite3.connect(self.path)
+            self.db.executescript(
+                "PRAGMA journal_mode = OFF; PRAGMA synchronous = OFF;"
+                "CREATE TABLE cases (case_id TEXT PRIMARY KEY, state INTEGER NOT NULL) WITHOUT ROWID;"
+            )
+
+        target = self.budget * SPILL_TARGET
+        batch = []
+        while self.memory and self.size > target:
+            case_id, state = self.memory.popitem(last=False)
+            self.size -= self.entry_size(case_id)
+            batch.append((case_id, state))
+        self.db.executemany("INSERT INTO cases VALUES (?, ?)", batch)
+        self.on_disk += len(batch)
+        self.spilled += len(batch)
+
+    def items(self):
+        """Every stored (case_id, state)."""
+        yield from self.memory.items()
+        if self.on_disk:
+            yield from self.db.execute("SELECT case_id, state FROM cases")
+
+    def stats(self):
+        return {
+            "cases": len(self),
+            "in_memory": len(self.memory),
+            "on_disk": self.on_disk,
+            "peak_cases": self.peak_cases,
+            "spilled": self.spilled,
+            "reloaded": self.reloaded,
+        }
+
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+            os.remove(self.path)
+            self.db = None
@@ -1,10 +1,40 @@
 """
-Creates a GoldStandardModel class and fills it in 'standards' which is a dictionary of such objects
+Creates a GoldStandardModel class and fills it in 'standards', a lazy registry of such objects:
+each model is only built (and its names cleaned) the first time it is looked up
 """
 
 
-from typing import Set, List, Tuple
-from dataclasses import dataclass
+import sys
+from collections.abc import Mapping
+from typing import Set, List, Tuple, FrozenSet
+from dataclasses import dataclass, field
+
+
+class RelationIndex:
+    """Interned, frozen view of a set of (a, b) relations for fast membership checks."""
+
+    __slots__ = ("ids", "pairs", "activities", "n_non_self")
+
+    def __init__(self, relations):
+        self.ids = {}
+        pairs = set()
+        for a, b in relations:
+            a, b = sys.intern(a), sys.intern(b)
+            self.ids.setdefault(a, len(self.ids))
+            self.ids.setdefault(b, len(self.ids))
+            pairs.add((a, b))
+        self.pairs: FrozenSet[Tuple[str, str]] = frozenset(pairs)
+        self.activities: FrozenSet[str] = frozenset(self.ids)
+        self.n_non_self = sum(1 for a, b in self.pairs if a != b)
+
+    def __contains__(self, pair):
+        return pair in self.pairs
+
+    def __iter__(self):
+        return iter(self.pairs)
+
+    def __len__(self):
+        return len(self.pairs)
 
 @dataclass
 class GoldStandardModel:
@@ -25,9 +55,40 @@ class GoldStandardModel:
     expected_transitions_count: int
     expected_arcs_count: int
 
-standards = {}
+    # Built by the registry on first access
+    index: RelationIndex = field(default=None, init=False, repr=False, compare=False)
+
+
+class GoldStandardRegistry(Mapping):
+    """Dataset name -> GoldStandardModel, materialised (and name-cleaned) on first access."""
 
-standards["L1.xes"] = GoldStandardModel(
+    def __init__(self):
+        self._factories = {}
+        self._models = {}
+
+    def register(self, dataset_name, factory):
+        """Register a zero-argument function that builds the model for `dataset_name`."""
+        self._factories[dataset_name] = factory
+        self._models.pop(dataset_name, None)
+
+    def __getitem__(self, dataset_name):
+        model = self._models.get(dataset_name)
+        if model is None:
+            model = underscore_names(self._factories[dataset_name]())
+            model.index = RelationIndex(model.direct_succession)
+            self._models[dataset_name] = model
+        return model
+
+    def __iter__(self):
+        return iter(self._factories)
+
+    def __len__(self):
+        return len(self._factories)
+
+
+standards = GoldStandardRegistry()
+
+standards.register("L1.xes", lambda: GoldStandardModel(
     dataset_name="L1.xes",
     textbook_figure="Fig. 6.1",
     description="After a: p1→{b,e}, p2→{c,e}; {b,e}→p3→d, {c,e}→p4→d",
@@ -51,10 +112,10 @@ standards["L1.xes"] = GoldStandardModel(
     expected_places_count=6,  # 4 internal + i_L + o_L
     expected_transitions_count=5,
     expected_arcs_count=16  # based on textbook figure
-)
+))
 
 
-standards["L2.xes"] = GoldStandardModel(
+standards.register("L2.xes", lambda: GoldStandardModel(
     dataset_name="L2.xes",
     textbook_figure="Fig. 6.2",
     description="a→{p1,p2}; p1→b→p3→{e,d}; p2→c→p4→{e,d}; e→p5→f→{p1,p2} (loop)",
@@ -78,9 +139,9 @@ standards["L2.xes"] = GoldStandardModel(
     expected_places_count=7,  # 5 internal + i_L + o_L
     expected_transitions_count=6,
     expected_arcs_count=18
-)
+))
 
-standards["L3.xes"] = GoldStandardModel(
+standards.register("L3.xes", lambda: GoldStandardModel(
     dataset_name="L3.xes",
     textbook_figure="Fig. 6.5",
     description="a→p1→b→{p2,p3}→{c,d}→{p4,p5}→e→p6→{f,g}; f loops to p1",
@@ -105,9 +166,9 @@ standards["L3.xes"] = GoldStandardModel(
     expected_places_count=8,  # 6 internal + i_L + o_L
     expected_transitions_count=7,
     expected_arcs_count=16
-)
+))
 
-standards["L4.xes"] = GoldStandardModel(
+standards.register("L4.xes", lambda: GoldStandardModel(
     dataset_name="L4.xes",
     textbook_figure="Fig. 6.6",
     description="Start→{a,b}→p1→c→p2→{d,e}→End",
@@ -125,9 +186,9 @@ standards["L4.xes"] = GoldStandardModel(
     expected_places_count=4,  # 2 internal + i_L + o_L
     expected_transitions_count=5,
     expected_arcs_count=10
-)
+))
 
-standards["L5.xes"] = GoldStandardModel(
+standards.register("L5.xes", lambda: GoldStandardModel(
     dataset_name="L5.xes",
     textbook_figure="Fig. 6.8",
     description="a→{p1,p2}; p1→e→p5→f; p2→b→p4→{c,f}; c→p3→d→p2 (loop)",
@@ -151,10 +212,10 @@ standards["L5.xes"] = GoldStandardModel(
     expected_places_count=7,  # 5 internal + i_L + o_L
     expected_transitions_count=6,
     expected_arcs_count=14
-)
+))
 
 
-standards["L6.xes"] = GoldStandardModel(
+standards.register("L6.xes", lambda: GoldStandardModel(
     dataset_name="L6.xes",
     textbook_figure="Fig. 6.9",
     description="Complete WF-net WITH redundant places p6 and p7 as shown in textbook",
@@ -179,9 +240,9 @@ standards["L6.xes"] = GoldStandardModel(
     expected_places_count=10,  # 8 internal + i_L + o_L
     expected_transitions_count=7,  # a,b,c,d,e,f,g
     expected_arcs_count=28  # includes all connections with redundant places
-)
+))
 
-standards["L7.xes"] = GoldStandardModel(
+standards.register("L7.xes", lambda: GoldStandardModel(
     dataset_name="L7.xes",
     textbook_figure="Fig. 6.10-6.11",
     description="Short loop: a→{b,c}, b can loop to itself (b*), then c",
@@ -199,9 +260,9 @@ standards["L7.xes"] = GoldStandardModel(
     expected_places_count=3,  # 1 internal + i_L + o_L
     expected_transitions_count=3,
     expected_arcs_count=8  # includes self-loop arcs
-)
+))
 
-standards["running-example.xes"] = GoldStandardModel(
+standards.register("running-example.xes", lambda: GoldStandardModel(
     dataset_name="running-example.xes",
     textbook_figure="Fig. 2.6",
     description="Insurance claim: register→{b||c}+d→(AND-join)→decide→{pay|reject|reinitiate}",
@@ -232,10 +293,10 @@ standards["running-example.xes"] = GoldStandardModel(
     expected_places_count=7,  # 5 internal (c1, c2, c3, c4, c5) + start + end
     expected_transitions_count=8,
     expected_arcs_count=22
-)
+))
 
 
-standards["billinstances.xes"] = GoldStandardModel(
+standards.register("billinstances.xes", lambda: GoldStandardModel(
     dataset_name="billinstances.xes",
     textbook_figure="Fig.11",
     description="Process P2: write bill -> print bill -> deliver bill (with shared printer)",
@@ -252,9 +313,9 @@ standards["billinstances.xes"] = GoldStandardModel(
     expected_places_count=4,  # 2 + start + end
     expected_transitions_count=3,
     expected_arcs_count=6
-)
+))
 
-standards["posterinstances.xes"] = GoldStandardModel(
+standards.register("posterinstances.xes", lambda: GoldStandardModel(
     dataset_name="posterinstances.xes",
     textbook_figure="Fig.11",
     description="Process P3: receive order and photo -> design photo poster -> print poster -> deliver poster",
@@ -274,9 +335,9 @@ standards["posterinstances.xes"] = GoldStandardModel(
     expected_places_count=5,  # 3 + start + end
     expected_transitions_count=4,
     expected_arcs_count=8
-)
+))
 
-standards["flyerinstances.xes"] = GoldStandardModel(
+standards.register("flyerinstances.xes", lambda: GoldStandardModel(
     dataset_name="flyerinstances.xes",
     textbook_figure="Fig.11",
     description="Process P1: Flyer with customer revision loop (send draft can loop back to design)",
@@ -300,10 +361,10 @@ standards["flyerinstances.xes"] = GoldStandardModel(
     expected_places_count=6,  # 4 + start + end
     expected_transitions_count=5,
     expected_arcs_count=12
-)
+))
 
 
-standards["BPI_Challenge_2012.xes"] = GoldStandardModel(
+standards.register("BPI_Challenge_2012.xes", lambda: GoldStandardModel(
     dataset_name="BPI_Challenge_2012.xes",
     textbook_figure="Empirical-BPI2012",
     description="Real-world loan application process - complete gold standard from discovered model",
@@ -366,7 +427,7 @@ standards["BPI_Challenge_2012.xes"] = GoldStandardModel(
     expected_places_count=20,  # Based on visible structure
     expected_transitions_count=24,
     expected_arcs_count=60  # Estimated from complex structure
-)
+))
 
 def underscore_names(model: GoldStandardModel) -> GoldStandardModel:
     """Replace spaces with underscores in all activity-related fields."""
@@ -388,7 +449,3 @@ def underscore_names(model: GoldStandardModel) -> GoldStandardModel:
     model.places = new_places
 
     return model
-
-
-for key in standards:
-    standards[key] = underscore_names(standards[key])
@@ -0,0 +1,41 @@
+"""
+Metrics of every grid search cell as (abs x rel) arrays, stored next to the results file as one .npz per dataset.
+
+The results file keeps only the top cells; the arrays keep all of them, so the report can show how the metrics
+change over the whole threshold grid (heatmaps) without running the search again. Cells without a value (e.g.
+fitness when replay was off) are NaN.
+"""
+
+import numpy as np
+
+GRID_METRICS = ("precision", "recall", "f1", "places", "flows", "mining_time", "fitness", "replay_precision")
+
+
+def grid_arrays(results, abs_values, rel_values):
+    """{"abs", "rel", <metric>: (len(abs_values), len(rel_values)) array} from the grid search result dicts."""
+    rows = {v: i for i, v in enumerate(abs_values)}
+    cols = {v: j for j, v in enumerate(rel_values)}
+    arrays = {"abs": np.asarray(abs_values, dtype=np.int64), "rel": np.asarray(rel_values, dtype=np.float64)}
+    for metric in GRID_METRICS:
+        arrays[metric] = np.full((len(abs_values), len(rel_values)), np.nan)
+    for result in results:
+        i, j = rows[result["abs"]], cols[result["rel"]]
+        for metric in GRID_METRICS:
+            if metric in result:
+                arrays[metric][i, j] = result[metric]
+    return arrays
+
+
+def save_grid(path, arrays):
+    """Write the arrays to `path` (.npz, uncompressed so loading is one read per array)."""
+    np.savez(path, **arrays)
+    return path
+
+
+def load_grid(path):
+    """Arrays written by save_grid, or None when the file is missing or unreadable."""
+    try:
+        with np.load(path) as data:
+            return {name: data[name] for name in data.files}
+    except (OSError, ValueError):
+        return None
@@ -1,24 +1,79 @@
 """
 Two separate import functions because our method and the PM4PY method both expect different formats
 Both clean the names to have spaces replaced by underscores, i.e.: "this place" would become "this_place"
+PM4Py is only imported inside read_xes_pm4py, so the custom miner path does not pay its import cost
 """
 
+import sys
 import xml.etree.ElementTree as ET
-from pm4py.objects.log.importer.xes import importer as xes_importer
-from pm4py.objects.log.util import sorting
-from pm4py.objects.log.obj import EventLog, Event, Trace
+from datetime import datetime, timezone
+
+XES_BACKENDS = ("etree", "lxml")
+
+
+class ActivityNames(dict):
+    """
+    Raw concept:name -> cleaned activity name, filled on first use.
+
+    Each distinct name is cleaned (spaces to underscores) and interned once per parse;
+    every event of the log then refers to that one string instead of its own copy.
+    """
+
+    def __missing__(self, raw):
+        name = self[raw] = sys.intern(raw.replace(" ", "_"))
+        return name
+
+
+def parse_timestamp(value):
+    """Parse an XES time:timestamp into epoch seconds (naive values are taken as UTC), None if unparseable."""
+    try:
+        ts = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.timestamp()
+
+
+def order_by_timestamp(events, timestamps):
+    """
+    Stable-sort one trace by timestamp, like PM4Py's sort_timestamp.
+
+    Already ordered traces (the common case) are detected in one linear pass and
+    returned untouched. Traces with a missing timestamp keep document order.
+    """
+    if None in timestamps:
+        return events
+    if all(t0 <= t1 for t0, t1 in zip(timestamps, timestamps[1:])):
+        return events
+    order = sorted(range(len(events)), key=timestamps.__getitem__)
+    return [events[i] for i in order]
+
+
+def read_xes(path, only_complete=True, backend="etree", sort_by_timestamp=False):
+    """Parse XES log into {case_id: [activities]}.
+
+    `backend` selects the parser: "etree" (stdlib, default) or "lxml" (faster
+    streaming parser, requires lxml). Both return identical logs.
+    With `sort_by_timestamp`, events are ordered by time:timestamp within each
+    case (as read_xes_pm4py does) instead of by document order.
+    """
+    if backend == "lxml":
+        return read_xes_lxml(path, only_complete=only_complete, sort_by_timestamp=sort_by_timestamp)
+    if backend != "etree":
+        raise ValueError(f"Unknown XES backend {backend!r}, expected one of {XES_BACKENDS}")
 
-def read_xes(path, only_complete=True):
-    """Parse XES log into {case_id: [activities]}."""
     tree = ET.parse(path)
     root = tree.getroot()
 
     ns = root.tag.split("}")[0] + "}" if "}" in root.tag else ""
+    clean = ActivityNames()
     log = {}
 
     for trace in root.findall(f"{ns}trace"):
         case_id = None
         events = []
+        timestamps = []
 
         for s in trace.findall(f"{ns}string"):
             if s.attrib.get("key") == "concept:name":
@@ -38,24 +93,130 @@ def read_xes(path, only_complete=True):
 
             if not only_complete or lifecycle is None or lifecycle == "complete":
                 if name:
-                    events.append(name)
+                    events.append(clean[name])
+                    if sort_by_timestamp:
+                        timestamp = None
+                        for d in e.findall(f"{ns}date"):
+                            if d.attrib.get("key") == "time:timestamp":
+                                timestamp = parse_timestamp(d.attrib.get("value"))
+                        timestamps.append(timestamp)
 
+        if sort_by_timestamp:
+            events = order_by_timestamp(events, timestamps)
         if events:
             log[case_id] = events
 
-    # Clean activity names
-    cleaned_log = {}
-    for case_id, activities in log.items():
-        cleaned_activities = [activity.replace(" ", "_") for activity in activities]
-        cleaned_log[case_id] = cleaned_activities
+    return log
 
-    return cleaned_log
 
+def read_xes_lxml(path, only_complete=True, sort_by_timestamp=False):
+    """Parse XES log into {case_id: [activities]} with lxml's streaming parser.
+
+    Only <trace> elements are materialised (tag-filtered iterparse) and only the
+    concept:name / lifecycle:transition strings are read. Each trace is freed
+    once processed, so memory stays flat on large logs like BPI_Challenge_2012.
+    """
+    log = {}
+    for case_id, events in iter_xes(path, only_complete=only_complete, sort_by_timestamp=sort_by_timestamp):
+        if case_id is None:
+            case_id = f"case_{len(log)+1}"
+        if events:
+            log[case_id] = events
+    return log
+
+
+def iter_xes(path, only_complete=True, sort_by_timestamp=False):
+    """
+    Stream (case_id, [activities]) per trace, in document order, with lxml.
+
+    case_id is None when the trace has no concept:name, and traces whose events are
+    all filtered out are yielded with an empty list. Stopping early skips the rest of the file.
+    """
+    for case_id, events, lifecycles, timestamps in _iter_trace_events(path, sort_by_timestamp):
+        if only_complete:
+            kept = [i for i, lifecycle in enumerate(lifecycles) if lifecycle is None or lifecycle == "complete"]
+            if len(kept) < len(events):
+                events = [events[i] for i in kept]
+                if sort_by_timestamp:
+                    timestamps = [timestamps[i] for i in kept]
+        if sort_by_timestamp:
+            events = order_by_timestamp(events, timestamps)
+        yield case_id, events
+
+
+def iter_xes_events(path, sort_by_timestamp=False):
+    """
+    Stream (case_id, [activities], [lifecycles]) per trace with lxml, keeping every event.
+
+    Lifecycles are lower-cased lifecycle:transition values (None when absent); events
+    without a concept:name are skipped, as in read_xes. With `sort_by_timestamp`, each
+    trace is ordered once over all its events.
+    """
+    for case_id, events, lifecycles, timestamps in _iter_trace_events(path, sort_by_timestamp):
+        if sort_by_timestamp:
+            order = order_by_timestamp(list(range(len(events))), timestamps)
+            events = [events[i] for i in order]
+            lifecycles = [lifecycles[i] for i in order]
+        yield case_id, events, lifecycles
+
+
+def _iter_trace_events(path, with_timestamps=False):
+    """
+    The lxml parser behind iter_xes and iter_xes_events: (case_id, [activities], [lifecycles], [timestamps])
+    per trace, in document order, for every event with a concept:name (timestamps only when asked, else None).
+    """
+    from lxml import etree
+
+    context = etree.iterparse(
+        path, events=("end",), tag="{*}trace", remove_blank_text=True, collect_ids=False
+    )
+    clean = ActivityNames()
+    for _, trace in context:
+        tag = trace.tag
+        ns = tag.split("}")[0] + "}" if "}" in tag else ""
+        string_tag, event_tag, date_tag = f"{ns}string", f"{ns}event", f"{ns}date"
+
+        case_id = None
+        events = []
+        lifecycles = []
+        timestamps = [] if with_timestamps else None
+
+        for child in trace:
+            if child.tag == event_tag:
+                name, lifecycle = None, None
+                for s in child.iterchildren(string_tag):
+                    key = s.get("key")
+                    if key == "concept:name":
+                        name = s.get("value")
+                    elif key == "lifecycle:transition":
+                        lifecycle = s.get("value").lower()
+
+                if name:
+                    events.append(clean[name])
+                    lifecycles.append(lifecycle)
+                    if with_timestamps:
+                        timestamp = None
+                        for d in child.iterchildren(date_tag):
+                            if d.get("key") == "time:timestamp":
+                                timestamp = parse_timestamp(d.get("value"))
+                        timestamps.append(timestamp)
+
+            elif case_id is None and child.tag == string_tag and child.get("key") == "concept:name":
+                case_id = child.get("value")
+
+        # Free the processed trace and everything parsed before it
+        trace.clear(keep_tail=True)
+        while trace.getprevious() is not None:
+            del trace.getparent()[0]
 
+        yield case_id, events, lifecycles, timestamps
 
 
-def read_xes_pm4py(path: str, only_complete: bool = True) -> EventLog:
+def read_xes_pm4py(path: str, only_complete: bool = True) -> "EventLog":
     """Import a XES log with PM4Py and clean activity names."""
+    from pm4py.objects.log.importer.xes import importer as xes_importer
+    from pm4py.objects.log.util import sorting
+    from pm4py.objects.log.obj import EventLog, Event, Trace
 
     # Import XES file
     log = xes_importer.apply(path)
@@ -0,0 +1,123 @@
+"""
+Parsed log that keeps every event together with its lifecycle transition, so each lifecycle policy is a view
+derived from one parse instead of a new pass over the XML.
+
+Events are stored as flat columns (activity id, lifecycle code) with per-case offsets, plus an index of the event
+positions of every lifecycle value. Policies:
+
+- complete:       events with lifecycle "complete" or without a lifecycle (same as read_xes(only_complete=True))
+- start:          events with lifecycle "start" or without a lifecycle
+- start_complete: start and complete events as separate activities ("A+start", "A+complete")
+- all:            every event (same as read_xes(only_complete=False))
+"""
+
+from array import array
+from heapq import merge
+
+from utils.import_xes import iter_xes_events
+from utils.net_model import NameTable
+
+LIFECYCLE_POLICIES = ("complete", "start", "start_complete", "all")
+
+# Lifecycle values selected by each policy (None: events without a lifecycle:transition)
+POLICY_LIFECYCLES = {
+    "complete": (None, "complete"),
+    "start": (None, "start"),
+    "start_complete": (None, "start", "complete"),
+}
+
+
+def filter_trace(events, lifecycles, policy):
+    """Apply a lifecycle policy to one trace given as parallel activity / lifecycle lists."""
+    if policy == "all":
+        return events
+    if policy not in POLICY_LIFECYCLES:
+        raise ValueError(f"Unknown lifecycle policy {policy!r}, expected one of {LIFECYCLE_POLICIES}")
+    selected = POLICY_LIFECYCLES[policy]
+    if policy == "start_complete":
+        return [a if lc is None else f"{a}+{lc}" for a, lc in zip(events, lifecycles) if lc in selected]
+    return [a for a, lc in zip(events, lifecycles) if lc in selected]
+
+
+class LifecycleLog:
+    """All events of a log with their lifecycle, as compact columns."""
+
+    __slots__ = ("case_ids", "offsets", "activity", "lifecycle", "names", "lifecycles", "index")
+
+    def __init__(self):
+        self.case_ids = []                # per case; None when the trace has no concept:name
+        self.offsets = array("q", [0])    # events of case i: offsets[i]:offsets[i + 1]
+        self.activity = array("i")        # per event, id into names
+        self.lifecycle = array("B")       # per event, code into lifecycles
+        self.names = NameTable()
+        self.lifecycles = NameTable([None])
+        self.index = {}                   # lifecycle value -> array of event positions
+
+    @classmethod
+    def from_xes(cls, path, sort_by_timestamp=False):
+        """Parse a XES log once, keeping all lifecycle transitions."""
+        log = cls()
+        positions = {}
+        for case_id, events, lifecycles in iter_xes_events(path, sort_by_timestamp=sort_by_timestamp):
+            log.case_ids.append(case_id)
+            for name, lifecycle in zip(events, lifecycles):
+                code = log.lifecycles.intern(lifecycle)
+                positions.setdefault(lifecycle, array("q")).append(len(log.activity))
+                log.activity.append(log.names.intern(name))
+                log.lifecycle.append(code)
+            log.offsets.append(len(log.activity))
+        log.index = positions
+        return log
+
+    def __len__(self):
+        return len(self.case_ids)
+
+    def counts(self):
+        """Number of events per lifecycle value."""
+        return {lifecycle: len(positions) for lifecycle, positions in self.index.items()}
+
+    def positions(self, policy):
+        """Sorted positions of the events selected by `policy`, merged from the lifecycle index."""
+        if policy == "all":
+            return range(len(self.activity))
+        if policy not in POLICY_LIFECYCLES:
+            raise ValueError(f"Unknown lifecycle policy {policy!r}, expected one of {LIFECYCLE_POLICIES}")
+        return merge(*(self.index[lc] for lc in POLICY_LIFECYCLES[policy] if lc in self.index))
+
+    def view(self, policy="complete"):
+        """
+        {case_id: [activities]} under a lifecycle policy, like read_xes.
+
+        Traces left empty are dropped, and traces without a concept:name get
+        "case_<n>" ids numbered as read_xes does.
+        """
+        names = self.names.names
+        lifecycles = self.lifecycles.names
+        activity, lifecycle, offsets = self.activity, self.lifecycle, self.offsets
+        rename = policy == "start_complete"
+
+        log = {}
+        case, end, events = 0, offsets[1] if self.case_ids else 0, []
+
+        def flush():
+            if events:
+                case_id = self.case_ids[case]
+                log[f"case_{len(log)+1}" if case_id is None else case_id] = events
+
+        for pos in self.positions(policy):
+            if pos >= end:
+                flush()
+                events = []
+                case += 1
+                while pos >= offsets[case + 1]:
+                    case += 1
+                end = offsets[case + 1]
+            name = names[activity[pos]]
+            if rename:
+                lc = lifecycles[lifecycle[pos]]
+                if lc is not None:
+                    name = f"{name}+{lc}"
+            events.append(name)
+        flush()
+
+        return log
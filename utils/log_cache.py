@@ -0,0 +1,136 @@
+"""
+Cache of parsed logs, so the grid search cells of one run (and later runs) do not re-parse the same XES file.
+
+Entries are keyed by the log's absolute path, size, modification time and the read_xes options, so an edited
+log is parsed again automatically. The last few logs are memoised in-process; when the ALPHA_MINER_CACHE_DIR
+environment variable is set (main.py --cache-dir does this), parsed logs are also pickled to that directory.
+
+With a lifecycle policy (see utils/lifecycle_log.py) the cached entry is the LifecycleLog of all events, and
+every policy is a view of it, so switching policies does not parse the XES file again.
+"""
+
+import hashlib
+import os
+import pickle
+import threading
+from contextlib import contextmanager
+
+from utils.import_xes import read_xes
+from utils.lifecycle_log import LifecycleLog
+
+CACHE_DIR_ENV = "ALPHA_MINER_CACHE_DIR"
+MEMORY_ENTRIES = 2
+# read_xes defaults: options left at them do not change the key, so load_log(path) and
+# load_log(path, sort_by_timestamp=False) share one entry
+DEFAULT_OPTIONS = {"only_complete": True, "backend": "etree", "sort_by_timestamp": False}
+
+_memory = {}
+_memory_lock = threading.Lock()  # logs may be prefetched from another thread (main.py's pipeline)
+
+
+def cache_key(path, **options) -> str:
+    """Key of a parsed log: path, size, mtime and parse options (other than defaults)."""
+    stat = os.stat(path)
+    options = {name: value for name, value in options.items() if DEFAULT_OPTIONS.get(name, ...) != value}
+    raw = repr((os.path.abspath(path), stat.st_size, stat.st_mtime_ns, sorted(options.items())))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def cache_file(path, cache_dir, **options) -> str:
+    """Path of the on-disk cache entry for a log."""
+    name = os.path.basename(path).replace(".xes", "")
+    return os.path.join(cache_dir, f"{name}-{cache_key(path, **options)[:16]}.pkl")
+
+
+def load_log(path, cache_dir=None, lifecycle=None, **options):
+    """
+    read_xes(path, **options), served from the in-process memo or the on-disk cache when possible.
+
+    With a `lifecycle` policy the log is the corresponding view of load_lifecycle_log
+    (only sort_by_timestamp applies then). The returned log is shared between callers
+    and must not be modified.
+    """
+    if lifecycle is not None:
+        sort_by_timestamp = options.get("sort_by_timestamp", False)
+        key = cache_key(path, lifecycle=lifecycle, sort_by_timestamp=sort_by_timestamp)
+        log = _recall(key)
+        if log is not None:
+            return log
+        store = load_lifecycle_log(path, cache_dir, sort_by_timestamp=sort_by_timestamp)
+        log = store.view(lifecycle)
+        _remember(key, log)
+        return log
+
+    return _load(path, cache_dir, lambda: read_xes(path, **options), **options)
+
+
+def load_lifecycle_log(path, cache_dir=None, sort_by_timestamp=False) -> LifecycleLog:
+    """LifecycleLog.from_xes(path), cached like load_log."""
+    return _load(path, cache_dir, lambda: LifecycleLog.from_xes(path, sort_by_timestamp=sort_by_timestamp),
+                 store="lifecycle", sort_by_timestamp=sort_by_timestamp)
+
+
+def _load(path, cache_dir, parse, **options):
+    """Return parse() for a log, from the memo or the on-disk cache (keyed by path and options) when possible."""
+    key = cache_key(path, **options)
+    log = _recall(key)
+    if log is not None:
+        return log
+
+    cache_dir = cache_dir or os.environ.get(CACHE_DIR_ENV)
+    if cache_dir:
+        entry = cache_file(path, cache_dir, **options)
+        try:
+            with open(entry, "rb") as f:
+                log = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            log = None
+
+    if log is None:
+        log = parse()
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp = f"{entry}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                pickle.dump(log, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, entry)
+
+    _remember(key, log)
+    return log
+
+
+def _recall(key):
+    """Memoised log for `key`, marked as most recently used; None when not memoised."""
+    with _memory_lock:
+        log = _memory.pop(key, None)
+        if log is not None:
+            _memory[key] = log
+    return log
+
+
+def _remember(key, log):
+    """Memoise a log, keeping only the most recently used ones in memory."""
+    with _memory_lock:
+        _memory.pop(key, None)
+        while len(_memory) >= MEMORY_ENTRIES:
+            _memory.pop(next(iter(_memory)))
+        _memory[key] = log
+
+
+@contextmanager
+def memory_entries(n):
+    """Temporarily memoise up to `n` logs, e.g. while the logs of the next datasets are prefetched."""
+    global MEMORY_ENTRIES
+    previous, MEMORY_ENTRIES = MEMORY_ENTRIES, max(n, MEMORY_ENTRIES)
+    try:
+        yield
+    finally:
+        MEMORY_ENTRIES = previous
+
+
+def is_cached(path, cache_dir=None, **options) -> bool:
+    """True when the parsed log is already in memory or on disk."""
+    if cache_key(path, **options) in _memory:
+        return True
+    cache_dir = cache_dir or os.environ.get(CACHE_DIR_ENV)
+    return bool(cache_dir) and os.path.exists(cache_file(path, cache_dir, **options))
@@ -0,0 +1,200 @@
+"""
+Compact result model for the frequency-based Alpha Miner.
+
+Activity and place names are stored once in a NameTable; relations, frequency tables and
+Petri net arcs keep int ids in `array` columns instead of nested Python lists.
+Every container still iterates in the legacy shape ([[a], [b]] pairs, [src, tgt] arcs,
+{"pair", "abs_freq", "rel_freq"} dicts), so evaluate.py, visualize.py and the YAML export keep working.
+
+The miner still derives its relations and net as lists and packs them at the end of a run (Relation.from_legacy,
+PetriNet.from_lists), so this shrinks what a finished miner keeps, not the peak memory of one run.
+"""
+
+from array import array
+from collections.abc import Sequence
+
+
+class NameTable:
+    """Interns names to consecutive int ids (id -> name via .names, name -> id via .ids)."""
+
+    __slots__ = ("names", "ids")
+
+    def __init__(self, names=()):
+        self.names = []
+        self.ids = {}
+        for name in names:
+            self.intern(name)
+
+    def intern(self, name) -> int:
+        """Return the id of `name`, adding it to the table if new."""
+        idx = self.ids.get(name)
+        if idx is None:
+            idx = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return idx
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, idx):
+        return self.names[idx]
+
+    def __contains__(self, name):
+        return name in self.ids
+
+
+class _PairColumns(Sequence):
+    """
+    Two parallel int columns over a shared NameTable.
+
+    Subclasses define `_legacy(a, b)`, the legacy item of the pair (a, b), or override
+    __getitem__ and __iter__ (FrequencyTable).
+    """
+
+    __slots__ = ("table", "src", "tgt")
+
+    def __init__(self, table: NameTable, pairs=()):
+        self.table = table
+        self.src = array("i")
+        self.tgt = array("i")
+        for a, b in pairs:
+            self.append(a, b)
+
+    def append(self, a, b):
+        """Append the pair (a, b) given by name."""
+        self.src.append(self.table.intern(a))
+        self.tgt.append(self.table.intern(b))
+
+    def pairs(self):
+        """Iterate over (a, b) name tuples."""
+        names = self.table.names
+        return ((names[a], names[b]) for a, b in zip(self.src, self.tgt))
+
+    def __len__(self):
+        return len(self.src)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(len(self))[idx]]
+        names = self.table.names
+        return self._legacy(names[self.src[idx]], names[self.tgt[idx]])
+
+    def __iter__(self):
+        return (self._legacy(a, b) for a, b in self.pairs())
+
+    def to_list(self):
+        """Materialise the legacy nested-list form."""
+        return list(self)
+
+    def __eq__(self, other):
+        if isinstance(other, _PairColumns):
+            return list(self.pairs()) == list(other.pairs())
+        return self.to_list() == other
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_list()!r})"
+
+
+class Relation(_PairColumns):
+    """Activity relation (direct followers, causality, parallel); items look like [[a], [b]]."""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_legacy(cls, table: NameTable, pairs):
+        """Pack legacy ([a], [b]) pairs."""
+        relation = cls(table)
+        for a, b in pairs:
+            relation.append(a[0], b[0])
+        return relation
+
+    def _legacy(self, a, b):
+        return [[a], [b]]
+
+
+class Arcs(_PairColumns):
+    """Flow relation of a Petri net; items look like [src, tgt]."""
+
+    __slots__ = ()
+
+    def _legacy(self, a, b):
+        return [a, b]
+
+
+class FrequencyTable(_PairColumns):
+    """
+    Direct-follower counts; items look like {"pair": ([a], [b]), "abs_freq": n, "rel_freq": f}.
+
+    The loop2 column counts the length-two loops `a b a` of each pair (a, b).
+    """
+
+    __slots__ = ("abs_freq", "rel_freq", "loop2")
+
+    def __init__(self, table: NameTable, items=()):
+        self.abs_freq = array("q")
+        self.rel_freq = array("d")
+        self.loop2 = array("q")
+        super().__init__(table)
+        for item in items:
+            self.add(*item)
+
+    def add(self, a, b, abs_f, rel_f, loop2=0):
+        """Append one counted pair (a, b)."""
+        self.append(a, b)
+        self.abs_freq.append(abs_f)
+        self.rel_freq.append(rel_f)
+        self.loop2.append(loop2)
+
+    def filter(self, abs_threshold, rel_threshold) -> Relation:
+        """Pairs with abs_freq >= abs_threshold and rel_freq >= rel_threshold."""
+        kept = Relation(self.table)
+        for a, b, abs_f, rel_f in zip(self.src, self.tgt, self.abs_freq, self.rel_freq):
+            if abs_f >= abs_threshold and rel_f >= rel_threshold:
+                kept.src.append(a)
+                kept.tgt.append(b)
+        return kept
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(len(self))[idx]]
+        names = self.table.names
+        return {
+            "pair": ([names[self.src[idx]]], [names[self.tgt[idx]]]),
+            "abs_freq": self.abs_freq[idx],
+            "rel_freq": self.rel_freq[idx],
+        }
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+
+class PetriNet:
+    """Places, transitions and arcs as int ids into one NameTable."""
+
+    __slots__ = ("table", "places", "transitions", "arcs")
+
+    def __init__(self, table: NameTable = None):
+        self.table = table if table is not None else NameTable()
+        self.places = array("i")
+        self.transitions = array("i")
+        self.arcs = Arcs(self.table)
+
+    @classmethod
+    def from_lists(cls, P_w, T_w, F_w, table: NameTable = None):
+        """Pack the list-based (P_w, T_w, F_w) representation."""
+        net = cls(table)
+        for t in T_w:
+            net.transitions.append(net.table.intern(t))
+        for p in P_w:
+            net.places.append(net.table.intern(p))
+        for src, tgt in F_w:
+            net.arcs.append(src, tgt)
+        return net
+
+    @property
+    def place_names(self):
+        return [self.table.names[p] for p in self.places]
+
+    @property
+    def transition_names(self):
+        return [self.table.names[t] for t in self.transitions]
@@ -0,0 +1,47 @@
+"""
+Pareto front of grid search results over several objectives.
+
+Each result is one row of an (n_cells, n_objectives) float array; a cell is on the front when no other cell is
+at least as good on every objective and strictly better on one.
+
+Mining time is not an objective: cells with the same model differ in it only by timer noise, which would make
+the front change from run to run. It is reported with the front as an attribute.
+"""
+
+import numpy as np
+
+# Objective name (result key) -> True when larger is better
+OBJECTIVES = {
+    "precision": True,
+    "recall": True,
+    "places": False,
+    "flows": False,
+}
+
+
+def objective_matrix(results, objectives=OBJECTIVES) -> np.ndarray:
+    """Collect the objectives of every result dict into an (n_results, n_objectives) array."""
+    matrix = np.empty((len(results), len(objectives)), dtype=np.float64)
+    for i, result in enumerate(results):
+        matrix[i] = [result[name] for name in objectives]
+    return matrix
+
+
+def pareto_mask(matrix: np.ndarray, maximize) -> np.ndarray:
+    """
+    Boolean mask of the non-dominated rows of `matrix`.
+
+    Rows are visited in lexicographic order of their (minimised) costs, so a row can only be dominated by a row
+    visited before it, and each row is compared against the current front only.
+    """
+    cost = np.where(np.asarray(maximize), -matrix, matrix)
+    mask = np.zeros(len(cost), dtype=bool)
+    front = np.empty((0, cost.shape[1]))
+
+    for i in np.lexsort(cost.T[::-1]):
+        c = cost[i]
+        dominated = np.any(np.all(front <= c, axis=1) & np.any(front < c, axis=1))
+        if not dominated:
+            mask[i] = True
+            front = np.vstack([front, c])
+    return mask
@@ -0,0 +1,192 @@
+"""
+Stage timing and opt-in profiling for the pipeline.
+
+Code wraps its steps in `with stage("name"):`. Wall time and call count per stage name are always recorded (cheap).
+When profiling is enabled (ALPHA_MINER_PROFILE=<dir>, or main.py --profile <dir>), every stage also runs under
+cProfile, and dump() writes per stage name:
+
+- <name>.prof:   pstats file (snakeviz, `python -m pstats`, ...)
+- <name>.folded: collapsed stacks ("root;caller;function microseconds"), for flamegraph.pl / speedscope
+
+A stage's profile excludes the time spent in stages nested inside it, which have their own files; the timing table
+is inclusive. Stage names are the same in both, so the two can be put side by side. Collapsed stacks are rebuilt
+from cProfile's caller graph (it does not keep full stacks), splitting each function's time over its callers.
+
+Timings and profiles are kept per group (main.py: one per dataset, set with `with group(name):`); stages outside
+any group belong to PIPELINE_GROUP. The group is a context variable, so it follows asyncio tasks and
+asyncio.to_thread calls. Nesting is tracked per thread, so stages may run in different threads (main.py's
+pipeline), as long as one stage name of one group is not active in two threads at once.
+"""
+
+import cProfile
+import os
+import pstats
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+PROFILE_ENV = "ALPHA_MINER_PROFILE"
+MAX_STACK_DEPTH = 40
+PIPELINE_GROUP = "_pipeline"
+
+# Keyed by (group, stage name)
+_timings = defaultdict(float)
+_calls = defaultdict(int)
+_profiles = {}
+_local = threading.local()  # .active: this thread's stack of enabled profilers
+_group = ContextVar("profiling_group", default=PIPELINE_GROUP)
+
+
+def profile_dir():
+    """Output directory when profiling is enabled, else None."""
+    return os.environ.get(PROFILE_ENV) or None
+
+
+@contextmanager
+def group(name):
+    """Record the stages run inside the block (and in tasks / threads started from it) under group `name`."""
+    token = _group.set(name)
+    try:
+        yield
+    finally:
+        _group.reset(token)
+
+
+@contextmanager
+def stage(name):
+    """Time a pipeline stage; also profile it when profiling is enabled."""
+    key = (_group.get(), name)
+    profiling = profile_dir() is not None
+    if profiling:
+        _active = _local.__dict__.setdefault("active", [])
+        # Pause the enclosing stage's profiler: nested stages are profiled separately
+        if _active:
+            _active[-1].disable()
+        profiler = _profiles.setdefault(key, cProfile.Profile())
+        _active.append(profiler)
+        profiler.enable()
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _timings[key] += time.perf_counter() - start
+        _calls[key] += 1
+        if profiling:
+            _active.pop().disable()
+            if _active:
+                _active[-1].enable()
+
+
+def timings(group=None):
+    """{stage: (calls, total seconds)} recorded so far in `group` (default: summed over all groups), slowest first."""
+    totals = defaultdict(lambda: [0, 0.0])
+    for (g, name), seconds in list(_timings.items()):
+        if group is None or g == group:
+            totals[name][0] += _calls[g, name]
+            totals[name][1] += seconds
+    return dict(sorted(((name, tuple(v)) for name, v in totals.items()), key=lambda x: -x[1][1]))
+
+
+def reset(group=None):
+    """Forget recorded timings and profiles of `group` (default: all)."""
+    for store in (_timings, _calls, _profiles):
+        for key in [key for key in store if group is None or key[0] == group]:
+            del store[key]
+
+
+def print_timings(title="Stage timings", group=None):
+    print(f"\n=== {title} ===")
+    for name, (calls, seconds) in timings(group).items():
+        print(f"{name:<24} {seconds:>9.3f} s  ({calls} call{'s' if calls != 1 else ''})")
+
+
+def collapsed_stacks(stats: pstats.Stats, resolution=1e-3):
+    """
+    Collapsed-stack lines from a pstats call graph.
+
+    Each function's own time is walked up its callers, split in proportion to the
+    time each caller accounts for, until a root (or MAX_STACK_DEPTH) is reached.
+    Shares below `resolution` of the profile's total time stop where they are
+    (as a shorter stack), which keeps the number of stacks bounded.
+    """
+    entries = stats.stats  # func -> (cc, nc, tottime, cumtime, callers)
+    min_seconds = resolution * sum(entry[2] for entry in entries.values())
+
+    def label(func):
+        filename, line, name = func
+        return f"{name} ({os.path.basename(filename)}:{line})" if line else name
+
+    folded = defaultdict(float)
+
+    def walk(func, seconds, path):
+        callers = entries.get(func, (0, 0, 0, 0, {}))[4]
+        callers = {c: v for c, v in callers.items() if c not in path}
+        total = sum(v[3] for v in callers.values())
+        if not callers or total <= 0 or len(path) >= MAX_STACK_DEPTH or seconds < min_seconds:
+            folded[";".join(label(f) for f in reversed(path))] += seconds
+            return
+        for caller, v in callers.items():
+            walk(caller, seconds * v[3] / total, path + (caller,))
+
+    for func, (_, _, tottime, _, _) in entries.items():
+        if tottime > 0:
+            walk(func, tottime, (func,))
+
+    return [f"{stack} {round(seconds * 1e6)}" for stack, seconds in sorted(folded.items()) if seconds >= 1e-6]
+
+
+def dump(output_dir=None, group=PIPELINE_GROUP):
+    """
+    Write <name>.prof and <name>.folded for every profiled stage of `group`, plus timings.txt.
+
+    Files go to output_dir/group (output_dir defaults to the ALPHA_MINER_PROFILE directory).
+    Returns the written .prof paths; does nothing when profiling is disabled.
+    """
+    output_dir = output_dir or profile_dir()
+    profiles = {name: profiler for (g, name), profiler in list(_profiles.items()) if g == group}
+    if output_dir is None or not profiles:
+        return []
+    folder = os.path.join(output_dir, group)
+    os.makedirs(folder, exist_ok=True)
+
+    paths = []
+    for name, profiler in profiles.items():
+        base = os.path.join(folder, name)
+        profiler.dump_stats(base + ".prof")
+        with open(base + ".folded", "w", encoding="utf-8") as f:
+            f.write("\n".join(collapsed_stacks(pstats.Stats(profiler))) + "\n")
+        paths.append(base + ".prof")
+
+    with open(os.path.join(folder, "timings.txt"), "w", encoding="utf-8") as f:
+        for name, (calls, seconds) in timings(group).items():
+            f.write(f"{name}\t{calls}\t{seconds:.6f}\n")
+    return paths
+
+
+def print_hot_functions(output_dir=None, top=20, since=None):
+    """
+    Print the `top` functions by own time over the .prof files under output_dir (all stages and datasets).
+
+    With `since` (a time.time() value), only files written from then on count, so profiles left in the
+    directory by earlier runs are not mixed in.
+    """
+    output_dir = output_dir or profile_dir()
+    if output_dir is None:
+        return
+    files = [
+        os.path.join(root, file)
+        for root, _, names in os.walk(output_dir)
+        for file in sorted(names) if file.endswith(".prof")
+    ]
+    if since is not None:
+        # One second of slack for file systems with coarse timestamps
+        files = [file for file in files if os.path.getmtime(file) >= since - 1]
+    if not files:
+        return
+
+    print(f"\n=== Top {top} functions by own time ({len(files)} stage profiles in {output_dir}) ===")
+    stats = pstats.Stats(*files)
+    stats.strip_dirs().sort_stats("tottime").print_stats(top)
@@ -0,0 +1,103 @@
+"""
+Cache-aware, parallel Graphviz rendering for the model and gold standard diagrams.
+
+Graphviz saves the DOT source next to the image (`output_path` and `output_path.png`).
+A job is skipped when that saved source hashes to the same digest as the new one and the image is present,
+so unchanged diagrams (e.g. the static gold standards) are not re-rendered on every run.
+The remaining jobs run concurrently: each render is its own Graphviz subprocess, driven from a thread pool.
+The graphviz package is only imported once something actually has to be rendered.
+A job that fails (Graphviz missing or erroring) is reported and does not stop the others.
+A render removes the diagram's images in the other IMAGE_FORMATS, so a model that switches to large-model mode
+(.svg) does not leave its old .png behind.
+"""
+
+import hashlib
+import os
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+# Formats a diagram may be rendered in (visualize.py: png, or svg in large-model mode)
+IMAGE_FORMATS = ("png", "svg")
+# graphviz raises ExecutableNotFound (a RuntimeError) and CalledProcessError; writing the source may raise OSError
+RENDER_ERRORS = (RuntimeError, OSError, subprocess.CalledProcessError)
+
+
+@dataclass(frozen=True)
+class RenderJob:
+    """One diagram to render: DOT source, output path (without extension), format and layout engine."""
+    source: str
+    output_path: str
+    format: str = "png"
+    engine: str = "dot"
+
+    @property
+    def image_path(self) -> str:
+        return f"{self.output_path}.{self.format}"
+
+
+def source_digest(source: str) -> str:
+    """SHA-256 of a DOT source."""
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+def is_up_to_date(job: RenderJob) -> bool:
+    """True when the saved DOT source matches the job and its image is not older than that source."""
+    if not (os.path.exists(job.output_path) and os.path.exists(job.image_path)):
+        return False
+    if os.path.getmtime(job.image_path) < os.path.getmtime(job.output_path):
+        return False
+    with open(job.output_path, "r", encoding="utf-8") as f:
+        return source_digest(f.read()) == source_digest(job.source)
+
+
+def render_job(job: RenderJob) -> str:
+    """Save the DOT source and render it, returning the image path; stale images in other formats are removed."""
+    import graphviz
+
+    directory = os.path.dirname(job.output_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(job.output_path, "w", encoding="utf-8") as f:
+        f.write(job.source)
+    path = graphviz.render(job.engine, job.format, job.output_path)
+    for fmt in IMAGE_FORMATS:
+        if fmt != job.format and os.path.exists(f"{job.output_path}.{fmt}"):
+            os.remove(f"{job.output_path}.{fmt}")
+    return path
+
+
+def render_all(jobs, workers=None):
+    """
+    Render every job whose DOT source changed, concurrently.
+
+    Returns (rendered, skipped, failed): lists of image paths. A failed job is
+    reported and does not stop the others.
+    """
+    pending, skipped = [], []
+    for job in jobs:
+        if is_up_to_date(job):
+            skipped.append(job.image_path)
+            print(f"Up to date, not re-rendered: {job.image_path}")
+        else:
+            pending.append(job)
+
+    def try_render(job):
+        try:
+            return render_job(job), None
+        except RENDER_ERRORS as e:
+            return job.image_path, e
+
+    rendered, failed = [], []
+    if pending:
+        workers = workers or min(len(pending), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for path, error in pool.map(try_render, pending):
+                if error is None:
+                    print(f"Rendered {path}")
+                    rendered.append(path)
+                else:
+                    print(f"Rendering failed for {path}: {error}")
+                    failed.append(path)
+
+    return rendered, skipped, failed
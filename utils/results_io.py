@@ -0,0 +1,115 @@
+"""
+Read and write experiment result files in one of several formats:
+
+- yaml:    human-readable (default); uses libyaml's C dumper/loader when PyYAML was built with it
+- json:    orjson when installed, the stdlib json module otherwise
+- msgpack: compact binary, requires the msgpack package
+
+Readers pick up whichever format is present; if a dataset has several, the most recently written file wins.
+"""
+
+import json
+import os
+from collections.abc import Sequence
+
+import yaml
+
+RESULT_FORMATS = {"yaml": ".yaml", "json": ".json", "msgpack": ".msgpack"}
+
+
+# --- loader fix for !!python/tuple tags (C-accelerated libyaml loader when available) ---
+class TupleSafeLoader(getattr(yaml, "CSafeLoader", yaml.SafeLoader)):
+    pass
+def construct_python_tuple(loader, node):
+    return tuple(loader.construct_sequence(node))
+TupleSafeLoader.add_constructor(u'tag:yaml.org,2002:python/tuple', construct_python_tuple)
+
+SafeDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+def to_serializable(obj):
+    """Convert tuples and the compact containers of utils.net_model into plain lists."""
+    if isinstance(obj, tuple):
+        return list(obj)
+    if isinstance(obj, Sequence) and not isinstance(obj, str):
+        return [to_serializable(x) for x in obj]
+    if isinstance(obj, dict):
+        return {k: to_serializable(v) for k, v in obj.items()}
+    return obj
+
+
+def write_results(data, base_path, fmt="yaml"):
+    """Write `data` to `base_path` + the extension of `fmt`, returning the file path."""
+    if fmt not in RESULT_FORMATS:
+        raise ValueError(f"Unknown result format {fmt!r}, expected one of {tuple(RESULT_FORMATS)}")
+
+    file_path = base_path + RESULT_FORMATS[fmt]
+    data = to_serializable(data)
+
+    if fmt == "yaml":
+        with open(file_path, "w") as f:
+            yaml.dump(data, f, Dumper=SafeDumper, sort_keys=False)
+    elif fmt == "json":
+        try:
+            import orjson
+        except ImportError:
+            with open(file_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+        else:
+            with open(file_path, "wb") as f:
+                f.write(orjson.dumps(data))
+    else:
+        import msgpack
+        with open(file_path, "wb") as f:
+            f.write(msgpack.packb(data))
+
+    return file_path
+
+
+def read_results(file_path):
+    """Read a result file written by write_results (format taken from the extension)."""
+    ext = os.path.splitext(file_path)[1]
+
+    if ext == RESULT_FORMATS["yaml"]:
+        with open(file_path, "r") as f:
+            return yaml.load(f, Loader=TupleSafeLoader)
+    if ext == RESULT_FORMATS["json"]:
+        with open(file_path, "rb") as f:
+            raw = f.read()
+        try:
+            import orjson
+        except ImportError:
+            return json.loads(raw)
+        return orjson.loads(raw)
+    if ext == RESULT_FORMATS["msgpack"]:
+        import msgpack
+        with open(file_path, "rb") as f:
+            return msgpack.unpackb(f.read())
+
+    raise ValueError(f"Unknown result file type: {file_path}")
+
+
+def find_result_files(folder):
+    """
+    Map each result file stem in `folder` to its newest file, in any supported format (sorted by stem).
+
+    Hidden files (such as the report's .report_index.json) are skipped.
+    """
+    newest = {}
+    for file in os.listdir(folder):
+        stem, ext = os.path.splitext(file)
+        if file.startswith(".") or ext not in RESULT_FORMATS.values():
+            continue
+        path = os.path.join(folder, file)
+        mtime = os.stat(path).st_mtime_ns
+        if stem not in newest or mtime > newest[stem][0]:
+            newest[stem] = (mtime, path)
+    return {stem: newest[stem][1] for stem in sorted(newest)}
+
+
+def read_latest_results(base_path):
+    """Read the newest of base_path.yaml / .json / .msgpack; empty dict when none exists."""
+    candidates = [base_path + ext for ext in RESULT_FORMATS.values() if os.path.exists(base_path + ext)]
+    if not candidates:
+        return {}
+    return read_results(max(candidates, key=lambda path: os.stat(path).st_mtime_ns))
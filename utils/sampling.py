@@ -0,0 +1,79 @@
+"""
+Helpers for approximate (sampled) mining of very large logs.
+
+- reservoir_sample: uniform sample of k traces from a stream of unknown length, in one pass
+- wilson_interval:  confidence interval of a proportion (here: rel_freq = count / outgoing count of a)
+- SampleInfo:       what was counted, plus the rel_freq bounds of every direct-follower pair
+
+The bounds treat each direct-follower occurrence as an independent draw. Occurrences within one trace are
+correlated, so on logs with many loops the true uncertainty is somewhat larger.
+"""
+
+import math
+import random
+from array import array
+from dataclasses import dataclass, field
+from statistics import NormalDist
+
+
+@dataclass
+class SampleInfo:
+    mode: str                 # "reservoir" or "convergence"
+    n_sampled: int            # traces counted
+    n_read: int               # traces parsed
+    complete: bool            # the whole log was read (n_read is its size)
+    converged: bool           # convergence mode: stopped because rel_freq settled
+    confidence: float
+    rel_low: array = field(default_factory=lambda: array("d"))   # per FrequencyTable row
+    rel_high: array = field(default_factory=lambda: array("d"))
+
+
+def reservoir_sample(items, k, seed=None):
+    """Uniform random sample of `k` items from an iterable (Algorithm R); returns (sample, items seen)."""
+    rng = random.Random(seed)
+    sample = []
+    n = 0
+    for n, item in enumerate(items, 1):
+        if n <= k:
+            sample.append(item)
+        else:
+            j = rng.randrange(n)
+            if j < k:
+                sample[j] = item
+    return sample, n
+
+
+def wilson_interval(successes, n, z):
+    """Wilson score interval (low, high) of the proportion successes / n."""
+    if n <= 0:
+        return 0.0, 1.0
+    p = successes / n
+    denom = 1 + z * z / n
+    centre = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+def z_score(confidence):
+    """Two-sided normal quantile for a confidence level (0.95 -> 1.96)."""
+    return NormalDist().inv_cdf(1 - (1 - confidence) / 2)
+
+
+def uncertain_pairs(freq, info: SampleInfo, rel_threshold):
+    """
+    Pairs whose rel_freq interval straddles `rel_threshold`: with the full log the filter could decide differently.
+
+    Returns [{"pair", "rel_freq", "low", "high", "kept"}], closest to the threshold first.
+    """
+    uncertain = []
+    for item, low, high in zip(freq, info.rel_low, info.rel_high):
+        if low < rel_threshold <= high:
+            uncertain.append({
+                "pair": item["pair"],
+                "rel_freq": item["rel_freq"],
+                "low": low,
+                "high": high,
+                "kept": item["rel_freq"] >= rel_threshold,
+            })
+    uncertain.sort(key=lambda u: abs(u["rel_freq"] - rel_threshold))
+    return uncertain
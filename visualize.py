@@ -1,34 +1,101 @@
 import os
-import graphviz
 from alpha_miner import  AlphaMinerFrequencies
+from utils.render import RenderJob, render_all
 
 # Manually set the path to the Graphviz "bin" directory
 os.environ["PATH"] += os.pathsep + r"C:\Program Files\Graphviz\bin"
 
-def visualize_model(miner: AlphaMinerFrequencies, output_path="model.dot"):
-    """Generate a DOT file for the discovered Petri net model."""
+# Nets with more arcs than this are drawn in large-model mode by default
+LARGE_MODEL_ARCS = 300
 
-    dot = graphviz.Digraph(format="png")
+def place_frequencies(miner: AlphaMinerFrequencies) -> dict:
+    """
+    Frequency of each internal place: summed abs_freq of the direct-follower
+    pairs (a, b) it connects, with P_w[i] built from Y_w[i - 1].
+    """
+    freq = miner.direct_follower_freq
+    names = freq.table.names
+    abs_freq = {(names[a], names[b]): f for a, b, f in zip(freq.src, freq.tgt, freq.abs_freq)}
+
+    weights = {}
+    for place, (inputs, outputs) in zip(miner.P_w[1:-1], miner.Y_w):
+        weights[place] = sum(abs_freq.get((a, b), 0) for a in inputs for b in outputs)
+    return weights
+
+def build_model_dot(miner: AlphaMinerFrequencies, large=False, min_place_freq=0) -> "graphviz.Digraph":
+    """
+    Build the Graphviz diagram for the discovered Petri net model.
+
+    In large-model mode the net is laid out with sfdp (force-directed, much
+    faster than dot on big nets) and written as SVG, and places whose
+    direct-follower frequency is below `min_place_freq` are left out together
+    with their arcs.
+    """
+    import graphviz
+
+    if large:
+        dot = graphviz.Digraph(format="svg", engine="sfdp")
+        dot.attr(overlap="false", splines="false", outputorder="edgesfirst")
+    else:
+        dot = graphviz.Digraph(format="png")
+
+    hidden = set()
+    if min_place_freq > 0:
+        hidden = {p for p, w in place_frequencies(miner).items() if w < min_place_freq}
 
     # Add places
     for p in miner.P_w:
-        dot.node(p, shape="circle")
+        if p not in hidden:
+            dot.node(p, shape="circle")
 
     # Add transitions
     for t in miner.T_w:
         dot.node(t, shape="box")
 
     # Add arcs (flows)
+    n_hidden_arcs = 0
     for src, tgt in miner.F_w:
+        if src in hidden or tgt in hidden:
+            n_hidden_arcs += 1
+            continue
         dot.edge(src, tgt)
 
-    # Save the file
-    dot.render(output_path, view=False)
-    print(f"Model visualized and saved to {output_path}.png")
+    if hidden:
+        dot.attr(label=f"{len(hidden)} places with frequency < {min_place_freq} "
+                       f"({n_hidden_arcs} arcs) not shown")
+
+    return dot
+
+def visualize_model(miner: AlphaMinerFrequencies, output_path="model.dot", render=True,
+                    large=None, min_place_freq=0) -> RenderJob:
+    """
+    Generate a DOT file (and image) for the discovered Petri net model.
+
+    With render=False the job is only returned, so the caller can render
+    several diagrams at once with utils.render.render_all.
+    `large=None` switches to large-model mode when the net has more than
+    LARGE_MODEL_ARCS arcs; pass True / False to force it.
+    """
+    if large is None:
+        large = len(miner.F_w) > LARGE_MODEL_ARCS
+    dot = build_model_dot(miner, large=large, min_place_freq=min_place_freq)
+    job = RenderJob(dot.source, output_path, format=dot.format, engine=dot.engine)
+
+    # Save the file (skipped when the existing image already matches)
+    if render:
+        if not render_all([job])[2]:
+            print(f"Model visualized and saved to {job.image_path}")
+    return job
 
 if __name__ == "__main__":
 
     miner = AlphaMinerFrequencies(abs_threshold=1, rel_threshold=0.4)
     miner.run("data/BPI_Challenge_2012.xes")
 
-    visualize_model(miner)
\ No newline at end of file
+    visualize_model(miner)
+
+    # Low thresholds give a much bigger net: force large-model mode and hide rare places
+    miner = AlphaMinerFrequencies(abs_threshold=1, rel_threshold=0.0)
+    miner.run("data/BPI_Challenge_2012.xes")
+
+    visualize_model(miner, "model_large.dot", large=True, min_place_freq=50)
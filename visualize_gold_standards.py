@@ -1,19 +1,20 @@
 import os
-import graphviz
 from utils.gold_standards import standards
+from utils.render import RenderJob, render_all
 
 # Optional: Add Graphviz to PATH (for Windows compatibility)
 os.environ["PATH"] += os.pathsep + r"C:\Program Files\Graphviz\bin"
 
-def visualize_gold_standard(model, output_dir="outputs/gold_standards"):
-    """Visualize a gold standard Petri net using Graphviz."""
-    os.makedirs(output_dir, exist_ok=True)
+def gold_standard_job(model, output_dir="outputs/gold_standards") -> RenderJob:
+    """Build the Graphviz render job for a gold standard Petri net."""
+    import graphviz
 
     dot = graphviz.Digraph(format="png")
     dataset_name = model.dataset_name.replace(".xes", "")
 
+    # Sets are iterated in sorted order so the DOT source (and its render cache key) is stable across runs
     # Add transitions (activities) as boxes
-    for t in model.activities:
+    for t in sorted(model.activities):
         dot.node(t, shape="box", style="filled", fillcolor="#f0f0f0")
 
     # Add places (circles)
@@ -22,30 +23,33 @@ def visualize_gold_standard(model, output_dir="outputs/gold_standards"):
         dot.node(place_name, shape="circle")
 
         # Connect transitions → place
-        for a in inputs:
+        for a in sorted(inputs):
             dot.edge(a, place_name)
         # Connect place → transitions
-        for b in outputs:
+        for b in sorted(outputs):
             dot.edge(place_name, b)
 
     # Add start and end place indicators
     dot.node("i_L", shape="circle", style="filled", fillcolor="#b2fab4")
-    for a in model.start_activities:
+    for a in sorted(model.start_activities):
         dot.edge("i_L", a)
 
     dot.node("o_L", shape="circle", style="filled", fillcolor="#ffb2b2")
-    for a in model.end_activities:
+    for a in sorted(model.end_activities):
         dot.edge(a, "o_L")
 
-    # Render the diagram
     output_path = os.path.join(output_dir, f"{dataset_name}_gold_standard")
-    dot.render(output_path, view=False)
-    print(f"Gold standard for {dataset_name} saved to {output_path}.png")
+    return RenderJob(dot.source, output_path, format=dot.format)
+
+def visualize_gold_standard(model, output_dir="outputs/gold_standards"):
+    """Visualize a gold standard Petri net using Graphviz."""
+    job = gold_standard_job(model, output_dir)
+    if not render_all([job])[2]:
+        print(f"Gold standard for {model.dataset_name.replace('.xes', '')} saved to {job.image_path}")
 
-def visualize_all_gold_standards():
-    """Generate visualizations for all gold standards."""
-    for name, model in standards.items():
-        visualize_gold_standard(model)
+def visualize_all_gold_standards(workers=None):
+    """Generate visualizations for all gold standards (unchanged ones are skipped)."""
+    render_all((gold_standard_job(model) for model in standards.values()), workers=workers)
 
 if __name__ == "__main__":
     visualize_all_gold_standards()